@@ -1,7 +1,7 @@
 from flask import Flask, request, render_template, jsonify
 from parser.graph_parser import parse_blueprint_graph_v2
 from parser.widget_parser import parse_v2 as parse_widget_v2
-from parser.formatters import MarkdownEventGraphFormatter, WidgetTreeFormatter, VerboseStrategy
+from parser.formatters import MarkdownEventGraphFormatter, WidgetTreeFormatter, VERBOSE_STRATEGY
 from parser.analyzer import GraphAnalyzer
 import re
 from typing import Optional, Tuple
@@ -40,8 +40,7 @@ def format_graph_content(graph) -> str:
         return "未找到可处理的入口节点"
     
     # 格式化输出
-    strategy = VerboseStrategy()  # 硬编码使用详细模式
-    formatter = MarkdownEventGraphFormatter(strategy)
+    formatter = MarkdownEventGraphFormatter(VERBOSE_STRATEGY)  # 硬编码使用详细模式
     
     results = []
     for ast_node in ast_nodes:
@@ -4,7 +4,11 @@ Blueprint Graph Analyzer
 支持新的统一解析模型架构
 """
 
-from typing import Dict, List, Optional, Callable, Set, Tuple, Any
+import reprlib
+import sys
+from collections import OrderedDict
+from itertools import islice
+from typing import AbstractSet, Dict, List, Optional, Callable, Set, Tuple, Any
 from dataclasses import dataclass, field
 
 from .models import (
@@ -31,7 +35,8 @@ from .common import (
     find_pin, create_source_location, get_pin_default_value, extract_pin_type,
     extract_variable_reference, extract_function_reference, extract_event_name,
     should_create_temp_variable_for_node, generate_temp_variable_name,
-    has_execution_pins, node_processor_registry, extract_macro_name, parse_object_path
+    has_execution_pins, node_processor_registry, extract_macro_name, parse_object_path,
+    PROCESSOR_KIND_EXPR
 )
 
 # 导入处理器模块以触发装饰器注册
@@ -42,6 +47,70 @@ from . import processors
 NodeProcessor = Callable[['AnalysisContext', GraphNode], Optional[ASTNode]]
 
 
+# 绑定注册表查找方法，避免热路径上的属性查找
+_registry_get_processor = node_processor_registry.get_processor
+
+# 处理器缓存未命中哨兵（区分"未缓存"与"缓存结果为None"）
+_MISS = object()
+
+# 共享的哨兵字面量表达式（无源位置信息，全局复用，请勿修改）
+NULL_LITERAL = LiteralExpression(value="null", literal_type="null")
+EMPTY_ARRAY_LITERAL = LiteralExpression(value="[]", literal_type="array")
+ZERO_INT_LITERAL = LiteralExpression(value="0", literal_type="int")
+CIRCULAR_REF_LITERAL = LiteralExpression(value="circular_ref", literal_type="error")
+
+# 参数解析时默认排除的引脚
+DEFAULT_EXCLUDE_PINS = frozenset({"self"})
+
+# 临时变量表达式缓存的最大条目数，超出后按LRU淘汰
+MEMOIZATION_CACHE_MAX_SIZE = 8192
+
+# 备用节点保留的关键属性及其有界表示
+FALLBACK_KEY_PROPERTIES = frozenset({"FunctionReference", "TargetType", "MacroGraphReference", "DelegatePropertyName"})
+_FALLBACK_REPR = reprlib.Repr()
+_FALLBACK_REPR.maxstring = 100
+_FALLBACK_REPR.maxother = 100
+
+# ForEachLoop 宏的循环变量输出引脚
+FOREACH_LOOP_VARIABLE_PINS = frozenset({"Array Element", "Array Index"})
+
+# 驻留的节点短类型名常量（与 GraphNode.short_type 比较）
+K2NODE_MACRO_INSTANCE = sys.intern("K2Node_MacroInstance")
+K2NODE_KNOT = sys.intern("K2Node_Knot")
+K2NODE_SELF = sys.intern("K2Node_Self")
+
+# 表达式构建分发表：short_type -> GraphAnalyzer 方法名
+# 替代 _resolve_node_expression_direct 中逐个子串匹配的 if/elif 链
+_EXPRESSION_BUILDER_DISPATCH: Dict[str, str] = {
+    "K2Node_VariableGet": "_build_property_access_expression",
+    "K2Node_DynamicCast": "_build_cast_expression",
+    "K2Node_CallFunction": "_process_call_function_as_expression",
+    "K2Node_CallFunctionOnMember": "_process_call_function_as_expression",
+    "K2Node_Literal": "_build_literal_expression",
+}
+
+# 数据流特殊节点分发表：short_type -> GraphAnalyzer 方法名
+_DATA_FLOW_DISPATCH: Dict[str, str] = {
+    K2NODE_SELF: "_build_self_expression",
+    K2NODE_KNOT: "_build_knot_expression",
+    "K2Node_GetArrayItem": "_build_array_item_expression",
+    "K2Node_PromotableOperator": "_build_promotable_operator_expression",
+    K2NODE_MACRO_INSTANCE: "_build_macro_data_expression",
+}
+
+# 可作为表达式引用的事件节点类型
+_EVENT_SHORT_TYPES = frozenset({"K2Node_Event", "K2Node_CustomEvent", "K2Node_ComponentBoundEvent"})
+
+# 可从符号表解析变量名的节点类型
+_VARIABLE_SHORT_TYPES = frozenset({"K2Node_VariableGet", "K2Node_VariableSet"})
+
+
+def _extract_target_type_name(node: GraphNode) -> str:
+    """从 TargetType 属性中解析目标类型名称"""
+    target_type_str = node.properties.get("TargetType", "UnknownType")
+    return parse_object_path(target_type_str) or "UnknownType"
+
+
 @dataclass
 class AnalysisContext:
     """
@@ -50,13 +119,19 @@ class AnalysisContext:
     graph: BlueprintGraph
     symbol_table: SymbolTable = field(default_factory=SymbolTable)  # 符号表，管理作用域和变量
     scope_manager: ScopeManager = field(default_factory=ScopeManager)  # 新增：作用域管理器，精确管理变量可见性
-    pin_usage_counts: Dict[str, int] = field(default_factory=dict)  # pin_key -> usage_count
+    pin_usage_counts: Dict[Tuple[str, str], int] = field(default_factory=dict)  # (node_guid, pin_id) -> usage_count
+    temp_eligible: Optional[Set[str]] = None  # 可提取临时变量的节点GUID集合（None表示未预计算）
+    node_by_name: Dict[str, GraphNode] = field(default_factory=dict)  # node_name -> 节点（同名取首个）
+    node_by_pin_id: Dict[str, GraphNode] = field(default_factory=dict)  # pin_id -> 所属节点（重复取首个）
     scope_prelude: List[Statement] = field(default_factory=list)  # 当前作用域的前置语句（临时变量声明等）
-    memoization_cache: Dict[str, Expression] = field(default_factory=dict)  # pin_key -> cached_expression
+    memoization_cache: 'OrderedDict[Tuple[str, str], Expression]' = field(default_factory=OrderedDict)  # (node_guid, pin_id) -> cached_expression（有界LRU）
+    declared_temp_keys: Set[Tuple[str, str]] = field(default_factory=set)  # 已声明临时变量的 (node_guid, pin_id)
     visited_nodes: Set[str] = field(default_factory=set)  # 已访问的节点GUID
     pin_ast_map: Dict[str, Expression] = field(default_factory=dict)  # pin_id -> AST表达式映射，用于循环变量等特殊节点
     # 新增：支持 NodeProcessingResult 的 continuation_pin 处理
     pending_continuation_pin: Optional['GraphPin'] = None  # 来自复杂节点（如 ForEachLoop）的延续执行引脚
+    processor_cache: Dict[Tuple[str, Optional[str]], Optional[Callable]] = field(default_factory=dict)  # (处理器键, 种类) -> 已解析的处理器（含未命中）
+    data_path: Set[Tuple[str, str]] = field(default_factory=set)  # 当前数据流解析路径上的 (node_guid, pin_id)，用于循环检测
 
 
 class GraphAnalyzer:
@@ -91,6 +166,8 @@ class GraphAnalyzer:
         
         # 如果是数据引脚，解析数据表达式
         elif pin.pin_type != "exec":
+            # 顶层入口：重置数据流路径（正常情况下已由 try/finally 清空）
+            context.data_path.clear()
             expression = self._resolve_data_expression(context, pin)
             return ResolutionResult(statements=[], expression=expression)
         
@@ -107,16 +184,15 @@ class GraphAnalyzer:
         主入口方法 - 使用统一解析模型架构
         简化版本：依赖 GraphBuilder 提供的完整入口节点列表
         """
-        # Pass 1: 符号与依赖分析
-        pin_usage_counts = self._perform_symbol_analysis(graph)
-        
-        # Pass 2: 上下文感知AST生成
         context = AnalysisContext(
             graph=graph,
-            symbol_table=SymbolTable(),  # 初始化符号表
-            pin_usage_counts=pin_usage_counts
+            symbol_table=SymbolTable()  # 初始化符号表
         )
         
+        # Pass 1: 符号与依赖分析（单次遍历构建所有派生索引）
+        self._build_indices(context)
+        
+        # Pass 2: 上下文感知AST生成
         # 简化的入口点处理：直接使用 GraphBuilder 提供的 entry_nodes
         # GraphBuilder 已经负责识别所有事件节点和其他入口点
         ast_nodes = []
@@ -128,21 +204,31 @@ class GraphAnalyzer:
         
         return ast_nodes
     
-    def _perform_symbol_analysis(self, graph: BlueprintGraph) -> Dict[str, int]:
+    def _build_indices(self, context: AnalysisContext) -> None:
         """
         Pass 1: 符号与依赖分析
-        遍历图中所有节点和连接，构建pin使用计数表
+        单次遍历图中所有节点和引脚，同时填充 pin 使用计数、临时变量资格
+        以及节点名称/引脚ID索引，避免对节点集合的多次扫描
+        函数/宏/变量引用不在此预提取：extract_* 按需提取并缓存在节点上，只有被访问到的节点付出提取开销
+        该遍历是纯解释器对象操作，受GIL限制，线程/进程分片反而更慢
         """
-        pin_usage_counts = {}
+        pin_usage_counts = context.pin_usage_counts
+        node_by_name = context.node_by_name
+        node_by_pin_id = context.node_by_pin_id
+        temp_eligible: Set[str] = set()
         
-        for node in graph.nodes.values():
+        for node in context.graph.nodes.values():
+            node_guid = node.node_guid
+            if should_create_temp_variable_for_node(node):
+                temp_eligible.add(node_guid)
+            node_by_name.setdefault(node.node_name, node)
             for pin in node.pins:
+                node_by_pin_id.setdefault(pin.pin_id, node)
                 # 统计每个输出引脚被连接的次数
-                if pin.direction == "output" and pin.linked_to:
-                    pin_key = f"{node.node_guid}:{pin.pin_id}"
-                    pin_usage_counts[pin_key] = len(pin.linked_to)
+                if pin.linked_to and pin.direction == "output":
+                    pin_usage_counts[(node_guid, pin.pin_id)] = len(pin.linked_to)
         
-        return pin_usage_counts
+        context.temp_eligible = temp_eligible
     
     def _process_node(self, context: AnalysisContext, node: GraphNode) -> Optional[ASTNode]:
         """
@@ -158,12 +244,12 @@ class GraphAnalyzer:
         processor_key = node.class_type
         
         # 阶段一：宏节点特殊处理
-        if node.class_type in ["K2Node_MacroInstance", "/Script/BlueprintGraph.K2Node_MacroInstance"]:
+        if node.short_type is K2NODE_MACRO_INSTANCE:
             macro_name = extract_macro_name(node)
             specific_key = f"{node.class_type}:{macro_name}"
             
-            # 尝试使用专用键查找
-            specific_processor = node_processor_registry.get_processor(specific_key)
+            # 尝试使用专用键查找（语句上下文不按种类过滤，见阶段二）
+            specific_processor = self._get_processor(context, specific_key)
             if specific_processor:
                 result = specific_processor(self, context, node)
                 # 处理 NodeProcessingResult 类型
@@ -176,7 +262,8 @@ class GraphAnalyzer:
             # 如果没有专用处理器，则 processor_key 保持原样，自然进入通用处理流程
         
         # 阶段二：专用处理器查找
-        processor = node_processor_registry.get_processor(processor_key)
+        # 语句上下文不按种类过滤：被执行流直接到达的表达式节点（如 K2Node_Literal）仍使用其处理器的结果
+        processor = self._get_processor(context, processor_key)
         if processor:
             result = processor(self, context, node)
             # 处理 NodeProcessingResult 类型
@@ -194,6 +281,19 @@ class GraphAnalyzer:
     
 
     
+    def _get_processor(self, context: AnalysisContext, key: str,
+                       kind: Optional[str] = None) -> Optional[Callable]:
+        """
+        查找处理器，结果（包括未命中）按 (键, 种类) 缓存在分析上下文中
+        kind 非空时只返回该种类或 "both" 种类的处理器
+        """
+        cache_key = (key, kind)
+        processor = context.processor_cache.get(cache_key, _MISS)
+        if processor is _MISS:
+            processor = _registry_get_processor(key, kind)
+            context.processor_cache[cache_key] = processor
+        return processor
+    
     def _create_fallback_node(self, context: AnalysisContext, node: GraphNode) -> FallbackNode:
         """
         备用处理器 - 三层梯度处理器策略的最后一层
@@ -203,13 +303,17 @@ class GraphAnalyzer:
         key_properties = {}
         for key, value in node.properties.items():
             # 只保留关键属性，避免输出过于冗长
-            if key in ["FunctionReference", "TargetType", "MacroGraphReference", "DelegatePropertyName"]:
-                key_properties[key] = str(value)[:100]  # 限制长度
+            if key not in FALLBACK_KEY_PROPERTIES:
+                continue
+            if isinstance(value, str):
+                key_properties[key] = value[:100]  # 限制长度
+            else:
+                # 非字符串值用有界 repr，避免先完整字符串化再截断
+                key_properties[key] = _FALLBACK_REPR.repr(value)[:100]
         
-        # 收集引脚信息
-        pin_info = []
-        for pin in node.pins[:10]:  # 限制引脚数量
-            pin_info.append((pin.pin_name, pin.direction, pin.pin_type))
+        # 收集引脚信息（限制引脚数量，不复制引脚列表）
+        pin_info = [(pin.pin_name, pin.direction, pin.pin_type)
+                    for pin in islice(node.pins, 10)]
         
         return FallbackNode(
             class_name=node.class_type,
@@ -223,91 +327,95 @@ class GraphAnalyzer:
         """
         专门处理数据流中的特殊节点类型
         解决剩余的UnsupportedExpression问题
+        通过 _DATA_FLOW_DISPATCH 单次字典查找分发到对应的构建方法
         """
-        # K2Node_Self: 返回self引用
-        if node.class_type in ["K2Node_Self", "/Script/BlueprintGraph.K2Node_Self"]:
-            return VariableGetExpression(
-                variable_name="self",
-                is_self_variable=True,
-                source_location=create_source_location(node)
-            )
+        handler_name = _DATA_FLOW_DISPATCH.get(node.short_type)
+        if handler_name:
+            return getattr(self, handler_name)(context, node)
+        return None
+    
+    def _build_self_expression(self, context: AnalysisContext, node: GraphNode) -> Expression:
+        """K2Node_Self: 返回self引用"""
+        return VariableGetExpression(
+            variable_name="self",
+            is_self_variable=True,
+            source_location=create_source_location(node)
+        )
+    
+    def _build_knot_expression(self, context: AnalysisContext, node: GraphNode) -> Expression:
+        """K2Node_Knot: 透明传递连接的值"""
+        # 查找输入引脚并递归解析
+        for pin in node.pins:
+            if pin.direction == "input" and pin.linked_to:
+                return self._resolve_data_expression(context, pin)
+        # 如果没有输入连接，返回null
+        return NULL_LITERAL
+    
+    def _build_array_item_expression(self, context: AnalysisContext, node: GraphNode) -> Expression:
+        """K2Node_GetArrayItem: 数组元素访问"""
+        array_pin = find_pin(node, "Array", "input")
+        index_pin = find_pin(node, "Index", "input")
         
-        # K2Node_Knot: 透明传递连接的值
-        elif node.class_type in ["K2Node_Knot", "/Script/BlueprintGraph.K2Node_Knot"]:
-            # 查找输入引脚并递归解析
-            for pin in node.pins:
-                if pin.direction == "input" and pin.linked_to:
-                    return self._resolve_data_expression(context, pin)
-            # 如果没有输入连接，返回null
-            return LiteralExpression(value="null", literal_type="null")
-        
-        # K2Node_GetArrayItem: 数组元素访问
-        elif node.class_type in ["K2Node_GetArrayItem", "/Script/BlueprintGraph.K2Node_GetArrayItem"]:
-            array_pin = find_pin(node, "Array", "input")
-            index_pin = find_pin(node, "Index", "input")
-            
-            array_expr = self._resolve_data_expression(context, array_pin) if array_pin else LiteralExpression(value="[]", literal_type="array")
-            index_expr = self._resolve_data_expression(context, index_pin) if index_pin else LiteralExpression(value="0", literal_type="int")
-            
-            return FunctionCallExpression(
-                target=array_expr,
-                function_name="Array_Get",
-                arguments=[("Index", index_expr)],
-                source_location=create_source_location(node)
-            )
+        array_expr = self._resolve_data_expression(context, array_pin) if array_pin else EMPTY_ARRAY_LITERAL
+        index_expr = self._resolve_data_expression(context, index_pin) if index_pin else ZERO_INT_LITERAL
         
-        # K2Node_PromotableOperator: 操作符调用
-        elif node.class_type in ["K2Node_PromotableOperator", "/Script/BlueprintGraph.K2Node_PromotableOperator"]:
-            # 从节点属性中提取操作符名称
-            func_ref = node.properties.get("FunctionReference", {})
-            if isinstance(func_ref, dict):
-                func_name = func_ref.get("MemberName", "UnknownOperator")
-            else:
-                func_name = "UnknownOperator"
-            
-            # 解析操作数
-            arguments = self._parse_function_arguments(context, node, exclude_pins={"self"})
-            
-            return FunctionCallExpression(
-                target=None,
-                function_name=str(func_name),
-                arguments=arguments,
-                source_location=create_source_location(node)
-            )
+        return FunctionCallExpression(
+            target=array_expr,
+            function_name="Array_Get",
+            arguments=[("Index", index_expr)],
+            source_location=create_source_location(node)
+        )
+    
+    def _build_promotable_operator_expression(self, context: AnalysisContext, node: GraphNode) -> Expression:
+        """K2Node_PromotableOperator: 操作符调用"""
+        # 从节点属性中提取操作符名称
+        func_ref = node.properties.get("FunctionReference", {})
+        if isinstance(func_ref, dict):
+            func_name = func_ref.get("MemberName", "UnknownOperator")
+        else:
+            func_name = "UnknownOperator"
         
-        # K2Node_MacroInstance: 在数据流中作为宏调用结果
-        elif node.class_type in ["K2Node_MacroInstance", "/Script/BlueprintGraph.K2Node_MacroInstance"]:
-            macro_name = extract_macro_name(node)
-            
-            # 特殊情况：ForEachLoop在数据流中应该返回循环变量而不是宏调用
-            if "ForEachLoop" in macro_name or "ForEach" in macro_name:
-                # 查找输出引脚，如果是循环变量输出，直接返回循环变量表达式
-                for pin in node.pins:
-                    if pin.direction == "output" and pin.pin_name in ["Array Element", "Array Index"]:
-                        # 检查ScopeManager中是否有对应的变量
-                        scope_expr = context.scope_manager.lookup_variable(pin.pin_id)
-                        if scope_expr:
-                            return scope_expr
-                        # 如果ScopeManager中没有，创建循环变量表达式
-                        is_index = "Index" in pin.pin_name
-                        return LoopVariableExpression(
-                            variable_name="ArrayIndex" if is_index else "ArrayElement",
-                            is_index=is_index,
-                            loop_id=node.node_guid,
-                            source_location=create_source_location(node)
-                        )
-            
-            # 其他宏实例：解析为宏调用
-            arguments = self._parse_function_arguments(context, node, exclude_pins={"self"})
-            
-            return FunctionCallExpression(
-                target=None,
-                function_name=f"Macro_{macro_name}",
-                arguments=arguments,
-                source_location=create_source_location(node)
-            )
+        # 解析操作数
+        arguments = self._parse_function_arguments(context, node)
         
-        return None
+        return FunctionCallExpression(
+            target=None,
+            function_name=str(func_name),
+            arguments=arguments,
+            source_location=create_source_location(node)
+        )
+    
+    def _build_macro_data_expression(self, context: AnalysisContext, node: GraphNode) -> Expression:
+        """K2Node_MacroInstance: 在数据流中作为宏调用结果"""
+        macro_name = extract_macro_name(node)
+        
+        # 特殊情况：ForEachLoop在数据流中应该返回循环变量而不是宏调用
+        if "ForEachLoop" in macro_name or "ForEach" in macro_name:
+            # 查找输出引脚，如果是循环变量输出，直接返回循环变量表达式
+            for pin in node.pins:
+                if pin.direction == "output" and pin.pin_name in FOREACH_LOOP_VARIABLE_PINS:
+                    # 检查ScopeManager中是否有对应的变量
+                    scope_expr = context.scope_manager.lookup_variable(pin.pin_id)
+                    if scope_expr:
+                        return scope_expr
+                    # 如果ScopeManager中没有，创建循环变量表达式
+                    is_index = "Index" in pin.pin_name
+                    return LoopVariableExpression(
+                        variable_name="ArrayIndex" if is_index else "ArrayElement",
+                        is_index=is_index,
+                        loop_id=node.node_guid,
+                        source_location=create_source_location(node)
+                    )
+        
+        # 其他宏实例：解析为宏调用
+        arguments = self._parse_function_arguments(context, node)
+        
+        return FunctionCallExpression(
+            target=None,
+            function_name=f"Macro_{macro_name}",
+            arguments=arguments,
+            source_location=create_source_location(node)
+        )
 
 
 
@@ -365,74 +473,88 @@ class GraphAnalyzer:
                         current_pin = pin
                         break
     
-    def _resolve_data_expression(self, context: AnalysisContext, pin: Optional[GraphPin], visited_path: Optional[Set[str]] = None) -> Expression:
+    def _resolve_data_expression(self, context: AnalysisContext, pin: Optional[GraphPin]) -> Expression:
         """
         解析数据引脚连接，构建表达式树 - 增强版本
         实现数据流递归解析，支持循环检测和类型信息提取
+        循环检测使用 context.data_path 共享集合，整个递归过程只分配一次
+        透传节点（K2Node_Knot）在循环内迭代跟随，长重路由链不再逐跳递归；
+        K2Node_Self 源节点直接生成 self 引用
         """
-        if not pin:
-            return LiteralExpression(value="null", literal_type="null")
-        
-        # 初始化访问路径（用于循环检测）
-        if visited_path is None:
-            visited_path = set()
-        
-        # 第一优先级：检查 ScopeManager 中的变量（解决 UnknownExpression 的核心）
-        scope_expression = context.scope_manager.lookup_variable(pin.pin_id)
-        if scope_expression:
-            return scope_expression
-        
-        # 第二优先级：检查 pin_ast_map（向后兼容）
-        if pin.pin_id in context.pin_ast_map:
-            return context.pin_ast_map[pin.pin_id]
-        
-        # 如果引脚没有连接，检查是否为符号表中的变量名或使用默认值
-        if not pin.linked_to:
-            # 尝试将pin名称作为变量名在符号表中查找
-            symbol = context.symbol_table.lookup(pin.pin_name)
-            if symbol:
-                return VariableGetExpression(
-                    variable_name=symbol.name,
-                    is_self_variable=not (symbol.is_loop_variable or symbol.is_callback_parameter)
-                )
-            
-            # 没有找到符号，使用默认值并提取类型信息
-            default_value = get_pin_default_value(pin)
-            ue_type = extract_pin_type(pin)
-            return LiteralExpression(
-                value=default_value, 
-                literal_type="auto",
-                expression_type=ue_type
-            )
-        
-        # 获取连接的源节点
-        source_link = pin.linked_to[0]
-        source_node_id = source_link.get("node_guid") or source_link.get("node_name")
-        source_pin_id = source_link.get("pin_id")
-        
-        # 查找源节点
-        source_node = None
-        if source_node_id:
-            source_node = self._find_node_by_id(context, source_node_id)
-        elif source_pin_id:
-            source_node = self._find_node_by_pin_id(context, source_pin_id)
-        
-        if not source_node:
-            return LiteralExpression(value="null", literal_type="null")
-        
-        # 循环检测
-        source_key = f"{source_node.node_guid}:{source_pin_id}"
-        if source_key in visited_path:
-            return LiteralExpression(value="circular_ref", literal_type="error")
-        
-        visited_path.add(source_key)
+        data_path = context.data_path
+        # 本次调用压入 data_path 的键（显式栈），退出时统一弹出
+        pushed_keys: List[Tuple[str, str]] = []
         
         try:
-            # 解析源节点表达式
-            result = self._resolve_node_expression(context, source_node, source_pin_id, visited_path)
-            return result
+            while True:
+                if not pin:
+                    return NULL_LITERAL
+                
+                # 第一优先级：检查 ScopeManager 中的变量（解决 UnknownExpression 的核心）
+                scope_expression = context.scope_manager.lookup_variable(pin.pin_id)
+                if scope_expression:
+                    return scope_expression
+                
+                # 第二优先级：检查 pin_ast_map（向后兼容）
+                if pin.pin_id in context.pin_ast_map:
+                    return context.pin_ast_map[pin.pin_id]
+                
+                # 如果引脚没有连接，检查是否为符号表中的变量名或使用默认值
+                if not pin.linked_to:
+                    # 尝试将pin名称作为变量名在符号表中查找
+                    symbol = context.symbol_table.lookup(pin.pin_name)
+                    if symbol:
+                        return VariableGetExpression(
+                            variable_name=symbol.name,
+                            is_self_variable=not (symbol.is_loop_variable or symbol.is_callback_parameter)
+                        )
+                    
+                    # 没有找到符号，使用默认值并提取类型信息
+                    default_value = get_pin_default_value(pin)
+                    ue_type = extract_pin_type(pin)
+                    return LiteralExpression(
+                        value=default_value, 
+                        literal_type="auto",
+                        expression_type=ue_type
+                    )
+                
+                # 获取连接的源节点
+                source_link = pin.linked_to[0]
+                source_node_id = source_link.get("node_guid") or source_link.get("node_name")
+                source_pin_id = source_link.get("pin_id")
+                
+                # 查找源节点
+                source_node = None
+                if source_node_id:
+                    source_node = self._find_node_by_id(context, source_node_id)
+                elif source_pin_id:
+                    source_node = self._find_node_by_pin_id(context, source_pin_id)
+                
+                if not source_node:
+                    return NULL_LITERAL
+                
+                # self 节点：直接构建引用，跳过符号表/临时变量/分发流程
+                if source_node.short_type is K2NODE_SELF:
+                    return self._build_self_expression(context, source_node)
+                
+                # 循环检测（元组键比字符串拼接更快）
+                source_key = (source_node.node_guid, source_pin_id)
+                if source_key in data_path:
+                    return CIRCULAR_REF_LITERAL
+                
+                data_path.add(source_key)
+                pushed_keys.append(source_key)
+                
+                # 透传节点：沿其已连接的输入引脚继续迭代，而不是递归
+                if source_node.short_type is K2NODE_KNOT:
+                    pin = next((p for p in source_node.pins if p.direction == "input" and p.linked_to), None)
+                    continue
+                
+                # 解析源节点表达式
+                return self._resolve_node_expression(context, source_node, source_pin_id)
         finally:
-            visited_path.remove(source_key)
+            for key in pushed_keys:
+                data_path.discard(key)
     
     # ========================================================================
     # 辅助方法
@@ -446,7 +568,11 @@ class GraphAnalyzer:
         if node_id in context.graph.nodes:
             return context.graph.nodes[node_id]
         
-        # 如果直接查找失败，遍历所有节点查找匹配的GUID或名称
+        # 使用预建的名称索引（O(1)）
+        if context.node_by_name:
+            return context.node_by_name.get(node_id)
+        
+        # 未建立索引时，遍历所有节点查找匹配的GUID或名称
         for node in context.graph.nodes.values():
             if node.node_guid == node_id or node.node_name == node_id:
                 return node
@@ -457,13 +583,17 @@ class GraphAnalyzer:
         """
         通过引脚ID查找包含该引脚的节点
         """
+        # 使用预建的引脚索引（O(1)）
+        if context.node_by_pin_id:
+            return context.node_by_pin_id.get(pin_id)
+        
         for node in context.graph.nodes.values():
             for pin in node.pins:
                 if pin.pin_id == pin_id:
                     return node
         return None
     
-    def _resolve_node_expression(self, context: AnalysisContext, node: GraphNode, pin_id: str, visited_path: Optional[Set[str]] = None) -> Expression:
+    def _resolve_node_expression(self, context: AnalysisContext, node: GraphNode, pin_id: str) -> Expression:
         """
         解析节点的表达式
         """
@@ -473,17 +603,29 @@ class GraphAnalyzer:
             return symbol_expr
         
         # 检查是否需要创建临时变量
-        pin_key = f"{node.node_guid}:{pin_id}"
+        pin_key = (node.node_guid, pin_id)
         usage_count = context.pin_usage_counts.get(pin_key, 0)
         
-        if usage_count > 1 and should_create_temp_variable_for_node(node):
+        # 优先使用 Pass 1 预计算的可提取节点集合
+        temp_eligible = context.temp_eligible
+        if usage_count > 1 and (
+            node.node_guid in temp_eligible if temp_eligible is not None
+            else should_create_temp_variable_for_node(node)
+        ):
+            # 命中缓存：刷新LRU顺序后直接返回
+            memoization_cache = context.memoization_cache
+            cached_expr = memoization_cache.get(pin_key)
+            if cached_expr is not None:
+                memoization_cache.move_to_end(pin_key)
+                return cached_expr
+            
             # 创建临时变量
             temp_var_name = generate_temp_variable_name(node, pin_id)
             
-            # 检查是否已经创建过这个临时变量
-            if pin_key not in context.memoization_cache:
+            # 检查是否已经声明过这个临时变量（缓存条目可能已被淘汰）
+            if pin_key not in context.declared_temp_keys:
                 # 解析原始表达式
-                original_expr = self._resolve_node_expression_direct(context, node, pin_id, visited_path)
+                original_expr = self._resolve_node_expression_direct(context, node, pin_id)
                 
                 # 创建临时变量声明
                 temp_decl = TemporaryVariableDeclaration(
@@ -494,86 +636,91 @@ class GraphAnalyzer:
                 
                 # 添加到作用域前置语句
                 context.scope_prelude.append(temp_decl)
-                
-                # 创建临时变量表达式
-                temp_expr = TemporaryVariableExpression(
-                    temp_var_name=temp_var_name,
-                    source_location=create_source_location(node)
-                )
-                
-                # 缓存结果
-                context.memoization_cache[pin_key] = temp_expr
+                context.declared_temp_keys.add(pin_key)
             
-            return context.memoization_cache[pin_key]
+            # 创建临时变量表达式
+            temp_expr = TemporaryVariableExpression(
+                temp_var_name=temp_var_name,
+                source_location=create_source_location(node)
+            )
+            
+            # 缓存结果，超出容量时淘汰最久未使用的条目
+            memoization_cache[pin_key] = temp_expr
+            if len(memoization_cache) > MEMOIZATION_CACHE_MAX_SIZE:
+                memoization_cache.popitem(last=False)
+            
+            return temp_expr
         else:
             # 直接解析表达式
-            return self._resolve_node_expression_direct(context, node, pin_id, visited_path)
+            return self._resolve_node_expression_direct(context, node, pin_id)
     
-    def _resolve_node_expression_direct(self, context: AnalysisContext, node: GraphNode, pin_id: str, visited_path: Optional[Set[str]] = None) -> Expression:
+    def _resolve_node_expression_direct(self, context: AnalysisContext, node: GraphNode, pin_id: str) -> Expression:
         """
         直接解析节点表达式，不使用临时变量
         """
-        # 根据节点类型进行特殊处理
-        if "K2Node_VariableGet" in node.class_type:
-            return self._build_property_access_expression(context, node)
-        elif "K2Node_DynamicCast" in node.class_type:
-            return self._build_cast_expression(context, node)
-        elif "K2Node_CallFunction" in node.class_type:
-            return self._process_call_function_as_expression(context, node)
-        elif "K2Node_Literal" in node.class_type:
-            # 字面量节点
-            default_value = node.properties.get("ObjectRef", "")
-            return LiteralExpression(value=default_value, literal_type="literal")
-        else:
-            # 特殊处理：事件节点作为表达式的情况
-            if node.class_type in ["K2Node_Event", "K2Node_CustomEvent", "K2Node_ComponentBoundEvent",
-                                   "/Script/BlueprintGraph.K2Node_Event", 
-                                   "/Script/BlueprintGraph.K2Node_CustomEvent",
-                                   "/Script/BlueprintGraph.K2Node_ComponentBoundEvent"]:
-                # 核心修复：检查是否引用事件的输出数据引脚
-                if pin_id:
-                    # 在事件节点的引脚列表中查找指定的pin_id
-                    for pin in node.pins:
-                        if pin.pin_id == pin_id and pin.direction == "output" and pin.pin_type != "exec":
-                            # 找到匹配的非exec类型输出引脚，创建PropertyAccessNode
-                            event_name = extract_event_name(node)
-                            event_ref = EventReferenceExpression(
-                                event_name=event_name,
-                                source_location=create_source_location(node)
-                            )
-                            return PropertyAccessNode(
-                                target=event_ref,
-                                property_name=pin.pin_name,
-                                source_location=create_source_location(node)
-                            )
-                
-                # 没有找到匹配的数据引脚或pin_id为空，返回事件引用
-                event_name = extract_event_name(node)
-                return EventReferenceExpression(
-                    event_name=event_name,
-                    source_location=create_source_location(node)
-                )
-            
-            # 专门的数据流表达式处理
-            data_flow_expression = self._try_build_data_flow_expression(context, node)
-            if data_flow_expression:
-                return data_flow_expression
-            
-            # 通用处理：尝试使用处理器
-            processor = node_processor_registry.get_processor(node.class_type)
-            if processor:
-                result = processor(self, context, node)
-                if isinstance(result, Expression):
-                    return result
-                # 删除了对Statement的处理，如果处理器错误地返回了Statement，让它直接失败
-            
-            # 新架构：不再产生 UnknownExpression，使用 FallbackNode 策略
-            # 如果到达这里，说明该节点无法作为表达式解析，返回一个描述性的字面量
-            return LiteralExpression(
-                value=f"UnsupportedExpression({node.class_type})", 
-                literal_type="unsupported",
-                source_location=create_source_location(node)
-            )
+        # 根据节点类型进行特殊处理（单次字典查找）
+        handler_name = _EXPRESSION_BUILDER_DISPATCH.get(node.short_type)
+        if handler_name:
+            return getattr(self, handler_name)(context, node)
+        
+        # 特殊处理：事件节点作为表达式的情况
+        if node.short_type in _EVENT_SHORT_TYPES:
+            return self._build_event_expression(node, pin_id)
+        
+        # 专门的数据流表达式处理
+        data_flow_expression = self._try_build_data_flow_expression(context, node)
+        if data_flow_expression:
+            return data_flow_expression
+        
+        # 通用处理：尝试使用处理器
+        processor = self._get_processor(context, node.class_type, PROCESSOR_KIND_EXPR)
+        if processor:
+            result = processor(self, context, node)
+            # 纯表达式处理器无需类型检查；"both" 种类可能返回语句
+            if processor.processor_kind == PROCESSOR_KIND_EXPR or isinstance(result, Expression):
+                return result
+            # 删除了对Statement的处理，如果处理器错误地返回了Statement，让它直接失败
+        
+        # 新架构：不再产生 UnknownExpression，使用 FallbackNode 策略
+        # 如果到达这里，说明该节点无法作为表达式解析，返回一个描述性的字面量
+        return LiteralExpression(
+            value=f"UnsupportedExpression({node.class_type})", 
+            literal_type="unsupported",
+            source_location=create_source_location(node)
+        )
+    
+    def _build_literal_expression(self, context: AnalysisContext, node: GraphNode) -> Expression:
+        """字面量节点"""
+        default_value = node.properties.get("ObjectRef", "")
+        return LiteralExpression(value=default_value, literal_type="literal")
+    
+    def _build_event_expression(self, node: GraphNode, pin_id: str) -> Expression:
+        """
+        事件节点作为表达式：引用事件的输出数据引脚时生成属性访问，否则生成事件引用
+        """
+        # 核心修复：检查是否引用事件的输出数据引脚
+        if pin_id:
+            # 在事件节点的引脚列表中查找指定的pin_id
+            for pin in node.pins:
+                if pin.pin_id == pin_id and pin.direction == "output" and pin.pin_type != "exec":
+                    # 找到匹配的非exec类型输出引脚，创建PropertyAccessNode
+                    event_name = extract_event_name(node)
+                    event_ref = EventReferenceExpression(
+                        event_name=event_name,
+                        source_location=create_source_location(node)
+                    )
+                    return PropertyAccessNode(
+                        target=event_ref,
+                        property_name=pin.pin_name,
+                        source_location=create_source_location(node)
+                    )
+        
+        # 没有找到匹配的数据引脚或pin_id为空，返回事件引用
+        event_name = extract_event_name(node)
+        return EventReferenceExpression(
+            event_name=event_name,
+            source_location=create_source_location(node)
+        )
     
     def _process_call_function_as_expression(self, context: AnalysisContext, node: GraphNode) -> FunctionCallExpression:
         """
@@ -598,19 +745,17 @@ class GraphAnalyzer:
             source_location=create_source_location(node)
         )
     
-    def _parse_function_arguments(self, context: AnalysisContext, node: GraphNode, exclude_pins: set = None) -> List[Tuple[str, Expression]]:
+    def _parse_function_arguments(self, context: AnalysisContext, node: GraphNode, exclude_pins: Optional[AbstractSet[str]] = None) -> List[Tuple[str, Expression]]:
         """
         解析函数参数，返回带表达式的参数列表
         """
         if exclude_pins is None:
-            exclude_pins = {"self"}
+            exclude_pins = DEFAULT_EXCLUDE_PINS
         
         arguments = []
         
-        for pin in node.pins:
-            if (pin.direction == "input" and 
-                pin.pin_type not in ["exec"] and
-                pin.pin_name not in exclude_pins):
+        for pin in node.data_input_pins():
+            if pin.pin_name not in exclude_pins:
                 arg_expr = self._resolve_data_expression(context, pin)
                 arguments.append((pin.pin_name, arg_expr))
         
@@ -658,13 +803,10 @@ class GraphAnalyzer:
             # 如果找不到 "Object" 引脚，尝试其他可能的名称
             object_pin = find_pin(node, "Target", "input")
         
-        source_expr = self._resolve_data_expression(context, object_pin) if object_pin else LiteralExpression(
-            value="null", literal_type="null"
-        )
+        source_expr = self._resolve_data_expression(context, object_pin) if object_pin else NULL_LITERAL
         
         # 2. 从节点属性中提取目标类型名称
-        target_type_str = node.properties.get("TargetType", "UnknownType")
-        target_type_name = parse_object_path(target_type_str) or "UnknownType"
+        target_type_name = _extract_target_type_name(node)
         
         # 3. 构建并返回 CastExpression AST 节点
         return CastExpression(
@@ -679,7 +821,7 @@ class GraphAnalyzer:
         尝试从符号表解析表达式
         """
         # 提取变量名
-        var_name = self._extract_variable_name_from_node(source_node)
+        var_name = self._extract_variable_name_from_node(context, source_node)
         if not var_name:
             return None
         
@@ -691,11 +833,11 @@ class GraphAnalyzer:
         # 检查输出引脚符号
         return self._check_output_pin_symbols(context, source_node, source_pin_id)
     
-    def _extract_variable_name_from_node(self, node: GraphNode) -> str:
+    def _extract_variable_name_from_node(self, context: AnalysisContext, node: GraphNode) -> str:
         """
         从节点中提取变量名
         """
-        if "K2Node_VariableGet" in node.class_type or "K2Node_VariableSet" in node.class_type:
+        if node.short_type in _VARIABLE_SHORT_TYPES:
             var_name, _ = extract_variable_reference(node)
             return var_name
         return ""
@@ -752,8 +894,7 @@ class GraphAnalyzer:
         # 构建特殊的处理器键来处理特定的宏类型
         if "ForEachLoop" in macro_graph or "ForEach" in macro_graph:
             # 使用特殊的注册键处理 ForEachLoop
-            from .common.decorators import get_processor
-            processor = get_processor("K2Node_MacroInstance:ForEachLoop")
+            processor = self._get_processor(context, "K2Node_MacroInstance:ForEachLoop")
             if processor:
                 result = processor(self, context, node)
                 if hasattr(result, 'continuation_pin'):
@@ -763,14 +904,12 @@ class GraphAnalyzer:
                 return result
         elif "WhileLoop" in macro_graph or "While" in macro_graph:
             # 使用特殊的注册键处理 WhileLoop
-            from .common.decorators import get_processor
-            processor = get_processor("K2Node_MacroInstance:WhileLoop")
+            processor = self._get_processor(context, "K2Node_MacroInstance:WhileLoop")
             if processor:
                 return processor(self, context, node)
         
         # 通用宏处理
-        from .common.decorators import get_processor
-        processor = get_processor("K2Node_MacroInstance")
+        processor = self._get_processor(context, "K2Node_MacroInstance")
         if processor:
             return processor(self, context, node)
         
@@ -19,13 +19,16 @@ from .graph_utils import (
 )
 
 # 装饰器系统
-from .decorators import register_processor, node_processor_registry
+from .decorators import (
+    register_processor, node_processor_registry,
+    PROCESSOR_KIND_EXPR, PROCESSOR_KIND_STMT, PROCESSOR_KIND_BOTH
+)
 
 # 对象解析器
 from .object_parser import BlueprintObjectParser
 
 # 构建器工具
-from .builder_utils import collect_all_raw_objects
+from .builder_utils import collect_all_raw_objects, extract_blueprint_path
 
 # 为了向后兼容，保留原有的导入方式
 __all__ = [
@@ -43,8 +46,9 @@ __all__ = [
     'extract_macro_name',
     # 装饰器系统
     'register_processor', 'node_processor_registry',
+    'PROCESSOR_KIND_EXPR', 'PROCESSOR_KIND_STMT', 'PROCESSOR_KIND_BOTH',
     # 对象解析器
     'BlueprintObjectParser',
     # 构建器工具
-    'collect_all_raw_objects'
+    'collect_all_raw_objects', 'extract_blueprint_path'
 ] 
\ No newline at end of file
@@ -9,20 +9,53 @@ from ..models import RawObject
 
 def collect_all_raw_objects(raw_objects: List[RawObject]) -> List[RawObject]:
     """
-    递归收集所有对象（包括嵌套的子对象）
+    收集所有对象（包括嵌套的子对象），按先序深度优先顺序输出
     
     该函数被WidgetBuilder和GraphBuilder共同使用, 用于扁平化RawObject树结构
+    使用显式栈代替递归，深层UI树不会触及解释器递归上限
     
     :param raw_objects: 根级别的RawObject列表
     :return: 包含所有对象（根对象和所有子对象）的扁平化列表
     """
     all_objects = []
+    stack = list(reversed(raw_objects))
     
-    def collect_recursive(objects):
-        for obj in objects:
-            all_objects.append(obj)
-            if obj.children:
-                collect_recursive(obj.children)
+    while stack:
+        obj = stack.pop()
+        all_objects.append(obj)
+        if obj.children:
+            stack.extend(reversed(obj.children))
     
-    collect_recursive(raw_objects)
-    return all_objects 
\ No newline at end of file
+    return all_objects
+
+
+def extract_blueprint_path(blueprint_text: str) -> str:
+    """
+    从蓝图原始文本中提取第一个 /Game/ 资源路径
+    
+    该函数被 Graph 与 Widget 两条解析管道共同使用
+    路径从 "/Game/" 延伸到下一个引号（或文本末尾），且其中需含有一个前后都有字符的点，
+    如 "/Game/BPs/UI/WBP_Foo.WBP_Foo_C"；用 str.find 实现，避免正则在整段文本上回溯
+    
+    :param blueprint_text: 蓝图原始文本
+    :return: 资源路径，未找到时返回空字符串
+    """
+    start = blueprint_text.find("/Game/")
+    while start != -1:
+        end = _find_quote(blueprint_text, start + 6)
+        if blueprint_text.find('.', start + 7, end - 1) != -1:
+            return blueprint_text[start:end]
+        # 本段内的其他 /Game/ 起点共享同一结尾且范围更小，同样不会匹配
+        start = blueprint_text.find("/Game/", end)
+    return ""
+
+
+def _find_quote(text: str, pos: int) -> int:
+    """返回 pos 之后第一个单引号或双引号的位置，没有时返回文本长度"""
+    single = text.find("'", pos)
+    double = text.find('"', pos)
+    if single == -1:
+        return double if double != -1 else len(text)
+    if double == -1:
+        return single
+    return min(single, double)
@@ -3,70 +3,98 @@
 包含用于节点处理器注册等功能的装饰器
 """
 
-from typing import Dict, Callable, List, Any
+import sys
+from typing import Dict, Callable, List, Any, Optional
 from functools import wraps
 
 
+# 处理器产出类型标签：纯表达式 / 语句 / 两者皆可（运行时按结果判断）
+PROCESSOR_KIND_EXPR = "expr"
+PROCESSOR_KIND_STMT = "stmt"
+PROCESSOR_KIND_BOTH = "both"
+
+# K2Node_ 短名称 -> 完整路径前缀；未列出的节点默认属于 BlueprintGraph 命名空间
+_SPECIAL_NAMESPACE_PREFIXES = {
+    "K2Node_CreateWidget": "/Script/UMGEditor.",
+    "K2Node_LatentAbilityCall": "/Script/GameplayAbilitiesEditor.",
+}
+_DEFAULT_NAMESPACE_PREFIX = "/Script/BlueprintGraph."
+
+
 class ProcessorRegistry:
     """节点处理器注册表"""
     
     def __init__(self):
         self._processors: Dict[str, Callable] = {}
     
-    def register(self, *node_types: str):
+    def register(self, *node_types: str, kind: str = PROCESSOR_KIND_BOTH):
         """
         注册节点处理器的装饰器
         增强版本：自动处理名称变体，减少样板代码
         
         :param node_types: 要处理的节点类型列表
+        :param kind: 处理器产出类型标签，记录在处理器的 processor_kind 属性上
         :return: 装饰器函数
         """
         def decorator(processor_func: Callable):
-            # 为每个节点类型注册处理器
+            processor_func.processor_kind = kind
+            
+            # 为每个节点类型注册处理器（同时登记名称变体）
             for node_type in node_types:
-                self._processors[node_type] = processor_func
-                
-                # 智能名称变体生成
-                if node_type.startswith("/Script/"):
-                    # 提取简短名称，如 "/Script/BlueprintGraph.K2Node_Event" -> "K2Node_Event"
-                    short_name = node_type.split('.')[-1]
-                    if short_name != node_type:  # 避免重复注册
-                        self._processors[short_name] = processor_func
-                
-                elif node_type.startswith("K2Node_"):
-                    # 为 K2Node_ 开头的节点自动生成完整路径变体
-                    # 根据节点类型推断正确的前缀
-                    full_path = self._generate_full_path(node_type)
-                    if full_path and full_path != node_type:
-                        self._processors[full_path] = processor_func
+                self._processors.update(
+                    dict.fromkeys(self._name_variants(node_type), processor_func)
+                )
             
             return processor_func
         return decorator
     
+    def _name_variants(self, node_type: str) -> tuple:
+        """
+        智能名称变体生成：返回节点类型本身及其短名称/完整路径变体（均已驻留）
+        
+        :param node_type: 注册的节点类型
+        :return: 需要登记的键元组
+        """
+        node_type = sys.intern(node_type)
+        
+        if node_type.startswith("/Script/"):
+            # 提取简短名称，如 "/Script/BlueprintGraph.K2Node_Event" -> "K2Node_Event"
+            short_name = node_type.rpartition('.')[2]
+            if short_name != node_type:  # 避免重复注册
+                return node_type, sys.intern(short_name)
+        
+        elif node_type.startswith("K2Node_"):
+            # 为 K2Node_ 开头的节点自动生成完整路径变体
+            return node_type, sys.intern(self._generate_full_path(node_type))
+        
+        return (node_type,)
+    
     def _generate_full_path(self, short_name: str) -> str:
         """
         为简短节点名称生成完整路径
-        根据节点类型智能推断正确的命名空间前缀
+        根据节点类型查表得到命名空间前缀
         
         :param short_name: 简短名称，如 "K2Node_Event"
         :return: 完整路径，如 "/Script/BlueprintGraph.K2Node_Event"
         """
-        # 特殊节点类型的命名空间映射
-        special_namespaces = {
-            "K2Node_CreateWidget": "/Script/UMGEditor",
-            "K2Node_LatentAbilityCall": "/Script/GameplayAbilitiesEditor",
-        }
-        
-        # 检查是否有特殊的命名空间映射
-        if short_name in special_namespaces:
-            return f"{special_namespaces[short_name]}.{short_name}"
-        
-        # 默认使用 BlueprintGraph 命名空间
-        return f"/Script/BlueprintGraph.{short_name}"
+        return _SPECIAL_NAMESPACE_PREFIXES.get(short_name, _DEFAULT_NAMESPACE_PREFIX) + short_name
     
-    def get_processor(self, node_type: str) -> Callable:
-        """获取节点类型对应的处理器"""
-        return self._processors.get(node_type)
+    def get_processor(self, node_type: str, kind: Optional[str] = None) -> Optional[Callable]:
+        """
+        获取节点类型对应的处理器
+        
+        :param node_type: 节点类型（处理器键）
+        :param kind: 调用上下文需要的产出类型，为None时不过滤；
+                     标签不匹配（且不是 both）的处理器视为不存在
+        :return: 处理器函数或None
+        """
+        processor = self._processors.get(node_type)
+        if processor is None or kind is None:
+            return processor
+        processor_kind = processor.processor_kind
+        if processor_kind == kind or processor_kind == PROCESSOR_KIND_BOTH:
+            return processor
+        return None
     
     def get_all_processors(self) -> Dict[str, Callable]:
         """获取所有注册的处理器"""
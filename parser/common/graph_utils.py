@@ -4,9 +4,25 @@
 """
 
 import re
+from functools import lru_cache
 from typing import Optional, Any, List, Tuple, Set
 from ..models import GraphNode, GraphPin, SourceLocation, Expression, LiteralExpression
 
+# 属性提取函数使用的预编译正则
+MEMBER_NAME_RE = re.compile(r'MemberName="([^"]+)"')
+MACRO_GRAPH_RE = re.compile(r'MacroGraph="[^"]*:([^"\']+)')
+
+# parse_object_path 结果缓存的最大条目数（路径字符串在 Slot/节点之间大量重复）
+OBJECT_PATH_CACHE_MAX_SIZE = 4096
+# 按 class_type 缓存的分类结果的最大条目数（class_type 来自输入文本，需有上限；与 models.SHORT_TYPE_CACHE_MAX_SIZE 一致）
+CLASS_TYPE_CACHE_MAX_SIZE = 512
+
+# 执行输出引脚的标准名称，按查找优先级排列
+EXECUTION_OUTPUT_PIN_NAMES = ("then", "exec")
+
+# 无法从 MacroGraphReference 提取宏名称时依次尝试的属性
+MACRO_NAME_FALLBACK_PROPERTIES = ("MacroName", "MacroType", "GraphName")
+
 
 # ================================================================
 # 原有的基础工具函数
@@ -21,8 +37,7 @@ def find_pin(node: GraphNode, pin_name: str, direction: str) -> Optional[GraphPi
     :param direction: 引脚方向 ("input" 或 "output")
     :return: 找到的引脚，如果没找到则返回None
     """
-    return next((pin for pin in node.pins 
-                if pin.pin_name == pin_name and pin.direction == direction), None)
+    return node.get_pin(pin_name, direction)
 
 
 def create_source_location(node: GraphNode) -> SourceLocation:
@@ -75,10 +90,31 @@ def extract_pin_type(pin: GraphPin) -> str:
     return base_type 
 
 
+def _quoted_object_name(cleaned_path: str) -> Optional[str]:
+    """
+    返回末尾单引号内的对象名：形如 "...'Name'" 或 "...'Name"，引号内需非空
+    用两次 rfind 定位引号，代替正则在每个引号位置上的尝试与回溯
+    """
+    if cleaned_path.endswith("'"):
+        # "...'Name'" 形式：结束引号之前需要有另一个引号且中间非空
+        closing = len(cleaned_path) - 1
+        opening = cleaned_path.rfind("'", 0, closing)
+        if opening != -1 and opening < closing - 1:
+            return cleaned_path[opening + 1:closing]
+        return None
+    # "...'Name" 形式：最后一个引号之后的内容（不以引号结尾，因此必然非空）
+    opening = cleaned_path.rfind("'")
+    if opening != -1:
+        return cleaned_path[opening + 1:]
+    return None
+
+
+@lru_cache(maxsize=OBJECT_PATH_CACHE_MAX_SIZE)
 def parse_object_path(path_string: str) -> Optional[str]:
     """
     从UE对象路径字符串中解析对象名称。
     增强版本，能够处理多种UE路径格式，包括TargetType等复杂情况。
+    纯函数，结果按路径字符串缓存。
 
     示例:
         "/Script/UMG.Border'Border_0'"  ->  "Border_0"
@@ -96,18 +132,11 @@ def parse_object_path(path_string: str) -> Optional[str]:
     cleaned_path = path_string.strip().strip('"').strip()
     
     # 处理 "/Script/UMG.Border'Border_0'" 格式：提取单引号内的内容
-    quote_match = re.search(r"'([^']+)'?$", cleaned_path)
-    if quote_match:
-        # 如果找到单引号，提取单引号内的内容作为对象名
-        object_name = quote_match.group(1)
-        
-        # 处理可能的点分隔路径，如 "WidgetTree.CanvasPanel_0"
-        if '.' in object_name:
-            # 取最后一个点后的部分
-            return object_name.rsplit('.', 1)[-1]
-        else:
-            # 直接返回单引号内的内容
-            return object_name
+    object_name = _quoted_object_name(cleaned_path)
+    if object_name is not None:
+        # 处理可能的点分隔路径，如 "WidgetTree.CanvasPanel_0"：取最后一个点后的部分
+        # 没有点时 rpartition 直接返回单引号内的完整内容
+        return object_name.rpartition('.')[2]
     
     # 如果没有单引号，按原来的逻辑处理
     path_to_parse = cleaned_path
@@ -116,17 +145,13 @@ def parse_object_path(path_string: str) -> Optional[str]:
     # 处理 /Script/UMG.UserWidget 或 /Game/Path.ClassName 格式
     if '.' in path_to_parse:
         # 按点分割，取最后一部分
-        name = path_to_parse.rsplit('.', 1)[-1]
-    elif '/' in path_to_parse:
-        # 按斜杠分割，取最后一部分
-        name = path_to_parse.rsplit('/', 1)[-1]
+        name = path_to_parse.rpartition('.')[2]
     else:
-        # 如果既没有点也没有斜杠，直接使用整个字符串
-        name = path_to_parse
+        # 按斜杠分割，取最后一部分；都没有时 rpartition 返回整个字符串
+        name = path_to_parse.rpartition('/')[2]
     
     # 进一步处理冒号分割的情况（如某些宏或特殊节点）
-    if ':' in name:
-        name = name.rsplit(':', 1)[-1]
+    name = name.rpartition(':')[2]
     
     return name if name else None 
 
@@ -137,27 +162,34 @@ def parse_object_path(path_string: str) -> Optional[str]:
 
 # 引脚名称别名映射表
 PIN_ALIAS_MAP = {
-    "then": ["then", "True"],
-    "else": ["else", "False"],
-    "exec": ["exec", "execute"],
-    "condition": ["Condition", "condition"],
-    "self": ["self", "Self"],
-    "target": ["Target", "TargetArray", "Array"],
+    "then": ("then", "True"),
+    "else": ("else", "False"),
+    "exec": ("exec", "execute"),
+    "condition": ("Condition", "condition"),
+    "self": ("self", "Self"),
+    "target": ("Target", "TargetArray", "Array"),
+}
+
+# (主名称, 方向) -> 按优先级排列的索引键元组，查找时无需再逐个拼装 (别名, 方向)
+_PIN_ALIAS_KEYS = {
+    (primary, direction): tuple((alias, direction) for alias in aliases)
+    for primary, aliases in PIN_ALIAS_MAP.items()
+    for direction in ("input", "output")
 }
 
 def find_pin_by_aliases(node: GraphNode, primary_name: str, direction: str) -> Optional[GraphPin]:
     """
     通过别名查找引脚，支持多种可能的引脚名称
+    按别名在 PIN_ALIAS_MAP 中的先后顺序探测节点的引脚索引（索引只获取一次）
     
     :param node: 要搜索的图节点
     :param primary_name: 主要引脚名称
     :param direction: 引脚方向 ("input" 或 "output")
     :return: 找到的引脚，如果没找到则返回None
     """
-    aliases = PIN_ALIAS_MAP.get(primary_name, [primary_name])
-    
-    for alias in aliases:
-        pin = find_pin(node, alias, direction)
+    pin_index = node.pin_index()
+    for key in _PIN_ALIAS_KEYS.get((primary_name, direction)) or ((primary_name, direction),):
+        pin = pin_index.get(key)
         if pin:
             return pin
     
@@ -169,7 +201,7 @@ def find_execution_output_pin(node: GraphNode) -> Optional[GraphPin]:
     查找节点的执行输出引脚
     """
     # 优先查找标准的执行输出引脚
-    for pin_name in ["then", "exec"]:
+    for pin_name in EXECUTION_OUTPUT_PIN_NAMES:
         pin = find_pin(node, pin_name, "output")
         if pin:
             return pin
@@ -196,6 +228,28 @@ def find_else_pin(node: GraphNode) -> Optional[GraphPin]:
 # 节点属性提取工具函数 - 从analyzer.py迁移
 # ================================================================
 
+_MEMBER_NAME_PREFIX = 'MemberName="'
+_MEMBER_NAME_PREFIX_LEN = len(_MEMBER_NAME_PREFIX)
+_SELF_CONTEXT_PREFIX = "bSelfContext="
+_SELF_CONTEXT_PREFIX_LEN = len(_SELF_CONTEXT_PREFIX)
+
+
+def _extract_member_name(reference: str) -> Optional[str]:
+    """
+    从引用字符串中提取 MemberName="..." 的值，结果与 MEMBER_NAME_RE.search 一致
+    常见情况用 str.find 直接切片，只有首个 MemberName 为空或缺少结束引号时才回退到正则
+    """
+    start = reference.find(_MEMBER_NAME_PREFIX)
+    if start < 0:
+        return None
+    start += _MEMBER_NAME_PREFIX_LEN
+    end = reference.find('"', start)
+    if end > start:
+        return reference[start:end]
+    match = MEMBER_NAME_RE.search(reference)
+    return match.group(1) if match else None
+
+
 def extract_variable_reference(node: GraphNode) -> Tuple[str, bool]:
     """
     提取变量引用信息的公共方法
@@ -203,33 +257,36 @@ def extract_variable_reference(node: GraphNode) -> Tuple[str, bool]:
     :param node: 图节点
     :return: (变量名, 是否为self上下文)
     """
+    var_ref = node.variable_reference
+    if var_ref is None:
+        var_ref = node.variable_reference = _compute_variable_reference(node)
+    return var_ref
+
+
+def _compute_variable_reference(node: GraphNode) -> Tuple[str, bool]:
+    """解析 VariableReference/SelfContextInfo，结果由 extract_variable_reference 缓存在节点上"""
     var_reference = node.properties.get("VariableReference", "")
-    var_name = "UnknownVariable"
-    is_self_context = True  # 默认值
-    
-    # 提取变量名
-    if isinstance(var_reference, dict):
-        var_name = var_reference.get("MemberName", "UnknownVariable")
-        is_self_context = var_reference.get("bSelfContext", True)
-    elif isinstance(var_reference, str) and "MemberName=" in var_reference:
-        match = re.search(r'MemberName="([^"]+)"', var_reference)
-        var_name = match.group(1) if match else "UnknownVariable"
+    ref_type = type(var_reference)
+    
+    # 常见的字典格式：直接返回
+    if ref_type is dict:
+        return var_reference.get("MemberName", "UnknownVariable"), var_reference.get("bSelfContext", True)
+    
+    if ref_type is str and "MemberName=" in var_reference:
+        var_name = _extract_member_name(var_reference) or "UnknownVariable"
         
-        # 检查 VariableReference 中的 bSelfContext
-        if "bSelfContext=True" in var_reference:
-            is_self_context = True
-        elif "bSelfContext=False" in var_reference:
-            is_self_context = False
-        else:
-            # 如果 VariableReference 中没有 bSelfContext，检查 SelfContextInfo
-            self_context_info = node.properties.get("SelfContextInfo", "")
-            is_self_context = self_context_info != "NotSelfContext"
+        # 检查 VariableReference 中的 bSelfContext（单次查找后只看等号后的值）
+        flag_index = var_reference.find(_SELF_CONTEXT_PREFIX)
+        if flag_index >= 0:
+            if var_reference.startswith("True", flag_index + _SELF_CONTEXT_PREFIX_LEN):
+                return var_name, True
+            if var_reference.startswith("False", flag_index + _SELF_CONTEXT_PREFIX_LEN):
+                return var_name, False
     else:
-        # 如果没有 VariableReference，检查 SelfContextInfo
-        self_context_info = node.properties.get("SelfContextInfo", "")
-        is_self_context = self_context_info != "NotSelfContext"
+        var_name = "UnknownVariable"
     
-    return var_name, is_self_context
+    # 没有可用的 bSelfContext 时，检查 SelfContextInfo
+    return var_name, node.properties.get("SelfContextInfo", "") != "NotSelfContext"
 
 
 def extract_function_reference(node: GraphNode) -> str:
@@ -240,6 +297,14 @@ def extract_function_reference(node: GraphNode) -> str:
     :param node: 图节点
     :return: 函数名称
     """
+    func_name = node.function_reference
+    if func_name is None:
+        func_name = node.function_reference = _compute_function_reference(node)
+    return func_name
+
+
+def _compute_function_reference(node: GraphNode) -> str:
+    """解析函数引用属性，结果由 extract_function_reference 缓存在节点上"""
     # 尝试从 FunctionReference 属性获取
     func_ref = node.properties.get("FunctionReference", "")
     if isinstance(func_ref, dict):
@@ -247,9 +312,9 @@ def extract_function_reference(node: GraphNode) -> str:
         if member_name:
             return member_name
     elif isinstance(func_ref, str) and "MemberName=" in func_ref:
-        match = re.search(r'MemberName="([^"]+)"', func_ref)
-        if match:
-            return match.group(1)
+        member_name = _extract_member_name(func_ref)
+        if member_name:
+            return member_name
     
     # 回退到其他可能的属性
     return (node.properties.get("FunctionName", "") or 
@@ -264,46 +329,76 @@ def extract_event_name(node: GraphNode) -> str:
     :param node: 图节点
     :return: 事件名称
     """
-    if 'K2Node_Event' in node.class_type:
-        # 标准事件节点：从EventReference.MemberName提取
-        event_ref = node.properties.get("EventReference", "")
-        if isinstance(event_ref, dict):
-            return event_ref.get("MemberName", node.node_name)
-        elif isinstance(event_ref, str) and "MemberName=" in event_ref:
-            match = re.search(r'MemberName="([^"]+)"', event_ref)
-            return match.group(1) if match else node.node_name
-        else:
-            return node.node_name
-            
-    elif 'K2Node_CustomEvent' in node.class_type:
-        # 自定义事件节点：从CustomFunctionName提取
-        custom_function_name = node.properties.get("CustomFunctionName", "")
-        if isinstance(custom_function_name, str):
-            event_name = custom_function_name.strip('"') if custom_function_name else node.node_name
-        else:
-            event_name = node.node_name
-        
-        # 如果事件名称为空，使用节点名称
-        if not event_name or event_name == "K2Node_CustomEvent":
-            event_name = "CustomEvent"
-        return event_name
-        
-    elif 'K2Node_ComponentBoundEvent' in node.class_type:
-        # 组件绑定事件：组合ComponentPropertyName.DelegatePropertyName
-        component_name = node.properties.get("ComponentPropertyName", "")
-        delegate_name = node.properties.get("DelegatePropertyName", "")
-        
-        if component_name and delegate_name:
-            return f"{component_name}.{delegate_name}"
-        elif delegate_name:
-            return delegate_name
-        else:
-            return node.node_name
-    
-    # 默认情况
+    event_name = node.event_name
+    if event_name is None:
+        event_name = node.event_name = _compute_event_name(node)
+    return event_name
+
+
+def _extract_standard_event_name(node: GraphNode) -> str:
+    """标准事件节点：从EventReference.MemberName提取"""
+    event_ref = node.properties.get("EventReference", "")
+    ref_type = type(event_ref)
+    if ref_type is dict:
+        return event_ref.get("MemberName", node.node_name)
+    elif ref_type is str and "MemberName=" in event_ref:
+        return _extract_member_name(event_ref) or node.node_name
+    return node.node_name
+
+
+def _extract_custom_event_name(node: GraphNode) -> str:
+    """自定义事件节点：从CustomFunctionName提取"""
+    custom_function_name = node.properties.get("CustomFunctionName", "")
+    if type(custom_function_name) is str:
+        event_name = custom_function_name.strip('"') if custom_function_name else node.node_name
+    else:
+        event_name = node.node_name
+    
+    # 如果事件名称为空，使用节点名称
+    if not event_name or event_name == "K2Node_CustomEvent":
+        event_name = "CustomEvent"
+    return event_name
+
+
+def _extract_component_bound_event_name(node: GraphNode) -> str:
+    """组件绑定事件：组合ComponentPropertyName.DelegatePropertyName"""
+    component_name = node.properties.get("ComponentPropertyName", "")
+    delegate_name = node.properties.get("DelegatePropertyName", "")
+    
+    if component_name and delegate_name:
+        return f"{component_name}.{delegate_name}"
+    elif delegate_name:
+        return delegate_name
     return node.node_name
 
 
+def _extract_default_event_name(node: GraphNode) -> str:
+    """默认情况：使用节点名称"""
+    return node.node_name
+
+
+# 事件类型子串 -> 名称提取函数，按匹配优先级排列
+_EVENT_NAME_EXTRACTORS = (
+    ('K2Node_Event', _extract_standard_event_name),
+    ('K2Node_CustomEvent', _extract_custom_event_name),
+    ('K2Node_ComponentBoundEvent', _extract_component_bound_event_name),
+)
+
+
+@lru_cache(maxsize=CLASS_TYPE_CACHE_MAX_SIZE)
+def _event_name_extractor(class_type: str):
+    """按 class_type 选择事件名称提取函数，子串匹配结果按类型缓存"""
+    for event_type, extractor in _EVENT_NAME_EXTRACTORS:
+        if event_type in class_type:
+            return extractor
+    return _extract_default_event_name
+
+
+def _compute_event_name(node: GraphNode) -> str:
+    """按节点类型解析事件名称，结果由 extract_event_name 缓存在节点上"""
+    return _event_name_extractor(node.class_type)(node)
+
+
 def extract_event_parameters(node: GraphNode) -> List[Tuple[str, str]]:
     """
     自动提取事件参数 - 从非执行的输出引脚中提取
@@ -312,11 +407,10 @@ def extract_event_parameters(node: GraphNode) -> List[Tuple[str, str]]:
     :return: 参数列表 [(参数名, 参数类型), ...]
     """
     parameters = []
-    for pin in node.pins:
-        if pin.direction == "output" and pin.pin_type != "exec":
-            # 跳过隐藏的引脚和特殊引脚
-            if not getattr(pin, 'bHidden', False) and pin.pin_name not in ["OutputDelegate"]:
-                parameters.append((pin.pin_name, pin.pin_type))
+    for pin in node.data_output_pins():
+        # 跳过隐藏的引脚和特殊引脚
+        if not pin.bHidden and pin.pin_name != "OutputDelegate":
+            parameters.append((pin.pin_name, pin.pin_type))
     return parameters
 
 
@@ -327,6 +421,33 @@ def extract_event_parameters(node: GraphNode) -> List[Tuple[str, str]]:
 
 
 
+# 需要提取临时变量的复杂节点类型（按匹配优先级排列，按子串匹配 class_type）
+TEMP_VARIABLE_NODE_TYPES = (
+    "K2Node_CallFunction",
+    "K2Node_CallArrayFunction",
+    "K2Node_DynamicCast",
+    "K2Node_MacroInstance",
+)
+
+# 复杂节点类型 -> 临时变量名前缀；CallFunction 额外拼接函数名
+_TEMP_VARIABLE_NAME_PREFIXES = {
+    "K2Node_DynamicCast": "temp_cast_",
+    "K2Node_MacroInstance": "temp_macro_",
+}
+
+
+@lru_cache(maxsize=CLASS_TYPE_CACHE_MAX_SIZE)
+def _temp_variable_node_kind(class_type: str) -> Optional[str]:
+    """
+    返回 class_type 所属的复杂节点类型，不属于时返回None
+    class_type 取值来自很小的重复词表，子串匹配结果按类型缓存
+    """
+    for node_type in TEMP_VARIABLE_NODE_TYPES:
+        if node_type in class_type:
+            return node_type
+    return None
+
+
 def should_create_temp_variable_for_node(source_node: GraphNode) -> bool:
     """
     判断是否应该为节点创建临时变量
@@ -335,14 +456,7 @@ def should_create_temp_variable_for_node(source_node: GraphNode) -> bool:
     :return: 是否应该创建临时变量
     """
     # 对于复杂的函数调用节点，创建临时变量
-    complex_node_types = [
-        "K2Node_CallFunction",
-        "K2Node_CallArrayFunction", 
-        "K2Node_DynamicCast",
-        "K2Node_MacroInstance"
-    ]
-    
-    return any(node_type in source_node.class_type for node_type in complex_node_types)
+    return _temp_variable_node_kind(source_node.class_type) is not None
 
 
 def generate_temp_variable_name(source_node: GraphNode, source_pin_id: str) -> str:
@@ -354,15 +468,12 @@ def generate_temp_variable_name(source_node: GraphNode, source_pin_id: str) -> s
     :return: 临时变量名称
     """
     # 基于节点类型生成有意义的临时变量名
-    if "K2Node_CallFunction" in source_node.class_type:
+    node_kind = _temp_variable_node_kind(source_node.class_type)
+    if node_kind == "K2Node_CallFunction":
         func_name = extract_function_reference(source_node)
         return f"temp_{func_name}_{source_node.node_guid[:8]}"
-    elif "K2Node_DynamicCast" in source_node.class_type:
-        return f"temp_cast_{source_node.node_guid[:8]}"
-    elif "K2Node_MacroInstance" in source_node.class_type:
-        return f"temp_macro_{source_node.node_guid[:8]}"
-    else:
-        return f"temp_{source_node.node_guid[:8]}"
+    prefix = _TEMP_VARIABLE_NAME_PREFIXES.get(node_kind, "temp_")
+    return f"{prefix}{source_node.node_guid[:8]}"
 
 
 # ================================================================
@@ -376,7 +487,7 @@ def has_execution_pins(node: GraphNode) -> bool:
     :param node: 图节点
     :return: 是否有执行引脚
     """
-    return any(pin.pin_type == "exec" for pin in node.pins)
+    return node.has_exec_pins()
 
 
 
@@ -394,7 +505,17 @@ def extract_macro_name(node: GraphNode) -> str:
     :param node: 宏节点 (K2Node_MacroInstance)
     :return: 宏名称，如 "ForEachLoop", "WhileLoop" 等，如果无法提取则返回 "Unknown"
     """
-    if not node or "K2Node_MacroInstance" not in node.class_type:
+    if not node:
+        return "Unknown"
+    macro_name = node.macro_name
+    if macro_name is None:
+        macro_name = node.macro_name = _compute_macro_name(node)
+    return macro_name
+
+
+def _compute_macro_name(node: GraphNode) -> str:
+    """解析节点属性得到宏名称，结果由 extract_macro_name 缓存在节点上"""
+    if "K2Node_MacroInstance" not in node.class_type:
         return "Unknown"
     
     # 尝试从 MacroGraphReference 属性中提取宏名称
@@ -405,21 +526,18 @@ def extract_macro_name(node: GraphNode) -> str:
         macro_graph = macro_ref.get("MacroGraph", "")
         if isinstance(macro_graph, str) and ":" in macro_graph:
             # 格式通常为: "/Script/Engine.EdGraph'/Engine/EditorBlueprintResources/StandardMacros.StandardMacros:ForEachLoop'"
-            # 提取冒号后的部分，并去除末尾的单引号
-            parts = macro_graph.split(":")
-            if len(parts) > 1:
-                macro_name = parts[-1].rstrip("'")
-                return macro_name
+            # 提取最后一个冒号后的部分，并去除末尾的单引号
+            return macro_graph.rpartition(":")[2].rstrip("'")
     elif isinstance(macro_ref, str):
         # 如果是字符串格式，使用正则表达式提取
         # 匹配形如 MacroGraph="/path/to/macro:MacroName" 的模式
-        match = re.search(r'MacroGraph="[^"]*:([^"\']+)', macro_ref)
+        match = MACRO_GRAPH_RE.search(macro_ref)
         if match:
             return match.group(1)
     
     # 如果无法从标准路径提取，尝试其他可能的属性
     # 某些版本的UE可能使用不同的属性名
-    for attr_name in ["MacroName", "MacroType", "GraphName"]:
+    for attr_name in MACRO_NAME_FALLBACK_PROPERTIES:
         if attr_name in node.properties:
             value = node.properties[attr_name]
             if isinstance(value, str) and value.strip():
@@ -5,10 +5,28 @@
 """
 
 import re
-from collections import deque
+import sys
 from typing import List, Dict, Optional
 from ..models import RawObject
 
+# 模块级预编译正则表达式，所有解析器实例共享
+EXPORT_PATH_RE = re.compile(r'ExportPath="([^"]+)"')
+# 行分词：MULTILINE 模式下一次 finditer 跳过空白行，并直接给出去掉首尾空白的行内容
+LINE_RE = re.compile(r"^[^\S\n]*(\S(?:[^\n]*\S)?)", re.MULTILINE)
+# 两种 Begin Object 格式合并为一个模式：class 分组未参与匹配时即为仅名称引用
+BEGIN_OBJ_RE = re.compile(
+    r"Begin Object (?:Class=(?P<class>[\w./_]+) )?Name=\"(?P<name>[\w_]+)\""
+)
+
+
+def _is_property_key(key: str) -> bool:
+    """检查属性键是否只由单词字符与括号组成"""
+    # 绝大多数键（NodeGuid、NodePosX 等）是纯字母数字，单次 C 级检查即可确认
+    if key.isalnum():
+        return True
+    core = key.replace('_', '').replace('(', '').replace(')', '')
+    return not core or core.isalnum()
+
 
 class BlueprintObjectParser:
     """
@@ -17,16 +35,6 @@ class BlueprintObjectParser:
     不包含任何业务逻辑，纯粹的文本结构解析
     """
     
-    def __init__(self):
-        # 预编译正则表达式以提高性能
-        self.begin_obj_with_class_re = re.compile(
-            r"Begin Object Class=(?P<class>[\w./_]+) Name=\"(?P<name>[\w_]+)\""
-        )
-        self.begin_obj_name_only_re = re.compile(
-            r"Begin Object Name=\"(?P<name>[\w_]+)\""
-        )
-        self.property_re = re.compile(r"([\w_()]+)=(.*)")
-    
     def parse(self, blueprint_text: str) -> List[RawObject]:
         """
         解析蓝图文本为 RawObject 列表
@@ -34,59 +42,78 @@ class BlueprintObjectParser:
         :param blueprint_text: 蓝图原始文本
         :return: RawObject 根节点列表
         """
-        if not blueprint_text or not blueprint_text.strip():
+        # isspace() 不复制文本；逐行 strip 已处理首尾空白，无需整体 strip
+        if not blueprint_text or blueprint_text.isspace():
             return []
         
         # 初始化解析状态
         objects_by_name: Dict[str, RawObject] = {}
-        object_stack: deque[RawObject] = deque()
+        object_stack: List[RawObject] = []
         root_objects: List[RawObject] = []
+        # 栈顶对象缓存在局部变量中，属性行无需每次索引栈；热循环中的方法预先绑定到局部变量
+        current_obj: Optional[RawObject] = None
+        parse_begin_object = self._parse_begin_object
+        parse_property_line = self._parse_property_line
+        
+        # 只有单独的 \r 换行符需要规范化；\r\n 中的 \r 会被 LINE_RE 当作行尾空白去掉
+        if blueprint_text.count('\r') != blueprint_text.count('\r\n'):
+            blueprint_text = blueprint_text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # 第一个 "Begin Object" 之前的行不会产生任何对象：用 str.find 整块跳过，
+        # 从该行行首开始分词（MULTILINE 的 ^ 只在真实行首匹配）
+        first_begin = blueprint_text.find("Begin Object")
+        if first_begin == -1:
+            return []
+        scan_start = blueprint_text.rfind('\n', 0, first_begin) + 1
         
-        # 逐行解析
-        for line_num, raw_line in enumerate(blueprint_text.strip().splitlines(), 1):
-            line = raw_line.strip()
+        # 逐行解析：单个正则 finditer 惰性产出非空行（已去除首尾空白），不构造行列表
+        for line_match in LINE_RE.finditer(blueprint_text, scan_start):
+            line = line_match.group(1)
             
-            # 跳过空行和注释
-            if not line or line.startswith("//"):
+            # 按首字符分派行类型：绝大多数属性行只需一次字符比较即可排除其他分支
+            first_char = line[0]
+            
+            # 跳过注释
+            if first_char == '/' and line.startswith("//"):
                 continue
             
             # 移除可能的BOM字符
-            if line.startswith('\ufeff'):
+            if first_char == '\ufeff':
                 line = line[1:]
+                first_char = line[:1]
             
             try:
                 # 检查是否是 Begin Object 行
-                if self._is_begin_object(line):
-                    obj, is_new_object = self._parse_begin_object(line, objects_by_name)
+                if first_char == 'B' and line.startswith("Begin Object"):
+                    obj, is_new_object = parse_begin_object(line, objects_by_name)
                     if obj:
                         # 只有新对象才需要添加到父对象或根对象列表
                         if is_new_object:
-                            if object_stack:
-                                object_stack[-1].children.append(obj)
+                            if current_obj is not None:
+                                current_obj.children.append(obj)
                             else:
                                 root_objects.append(obj)
                         object_stack.append(obj)
+                        current_obj = obj
                 
                 # 检查是否是 End Object 行
-                elif line.startswith("End Object"):
+                elif first_char == 'E' and line.startswith("End Object"):
                     if object_stack:
                         object_stack.pop()
+                        current_obj = object_stack[-1] if object_stack else None
                 
                 # 解析属性行
-                elif object_stack:
-                    self._parse_property_line(line, object_stack[-1])
+                elif current_obj is not None:
+                    parse_property_line(line, current_obj)
                     
             except Exception as e:
-                # 解析错误时继续处理下一行，不中断整个解析过程
+                # 解析错误时继续处理下一行，不中断整个解析过程（行号仅在出错时计算）
+                line_num = blueprint_text.count('\n', 0, line_match.start()) + 1
                 print(f"Warning: Failed to parse line {line_num}: {line} - {e}")
                 continue
         
         return root_objects
     
-    def _is_begin_object(self, line: str) -> bool:
-        """检查是否是 Begin Object 行"""
-        return line.startswith("Begin Object")
-    
     def _parse_begin_object(self, line: str, objects_by_name: Dict[str, RawObject]) -> tuple[Optional[RawObject], bool]:
         """
         解析 Begin Object 行，创建或获取 RawObject
@@ -95,35 +122,35 @@ class BlueprintObjectParser:
         :param objects_by_name: 已创建的对象字典
         :return: (解析出的 RawObject 或 None, 是否为新对象)
         """
-        # 尝试匹配 "Begin Object Class=... Name=..." 格式
-        class_match = self.begin_obj_with_class_re.search(line)
-        if class_match:
-            obj_name = class_match.group("name")
-            obj_class = class_match.group("class")
+        # 单次匹配同时识别两种格式（调用方已确认行以 "Begin Object" 开头）
+        begin_match = BEGIN_OBJ_RE.match(line)
+        if not begin_match:
+            return None, False
+        
+        obj_name = begin_match.group("name")
+        obj_class = begin_match.group("class")
+        
+        # "Begin Object Class=... Name=..." 格式
+        if obj_class is not None:
             obj = RawObject(name=obj_name, class_type=obj_class)
             
             # 检查是否有 ExportPath 属性
-            export_path_match = re.search(r'ExportPath="([^"]+)"', line)
+            export_path_match = EXPORT_PATH_RE.search(line)
             if export_path_match:
                 obj.properties["ExportPath"] = export_path_match.group(1)
             
             objects_by_name[obj_name] = obj
             return obj, True  # 新对象
         
-        # 尝试匹配 "Begin Object Name=..." 格式（重新引用已存在的对象）
-        name_match = self.begin_obj_name_only_re.search(line)
-        if name_match:
-            obj_name = name_match.group("name")
-            if obj_name in objects_by_name:
-                # 返回已存在的对象，用于设置其属性
-                return objects_by_name[obj_name], False  # 已存在的对象
-            else:
-                # 如果对象不存在，创建一个新的空对象
-                obj = RawObject(name=obj_name, class_type="")
-                objects_by_name[obj_name] = obj
-                return obj, True  # 新对象
-        
-        return None, False
+        # "Begin Object Name=..." 格式（重新引用已存在的对象）
+        existing = objects_by_name.get(obj_name)
+        if existing is not None:
+            # 返回已存在的对象，用于设置其属性
+            return existing, False  # 已存在的对象
+        # 如果对象不存在，创建一个新的空对象
+        obj = RawObject(name=obj_name, class_type="")
+        objects_by_name[obj_name] = obj
+        return obj, True  # 新对象
     
     def _parse_property_line(self, line: str, current_obj: RawObject) -> None:
         """
@@ -134,25 +161,21 @@ class BlueprintObjectParser:
         """
         # 特殊处理 CustomProperties Pin 格式
         if line.startswith("CustomProperties Pin"):
-            # 为每个 Pin 创建唯一的键名
-            pin_count = len([k for k in current_obj.properties.keys() if k.startswith("CustomProperties Pin")])
-            key = f"CustomProperties Pin {pin_count + 1}"
             # 提取括号内的内容作为值
-            if '(' in line and ')' in line:
-                start = line.find('(')
-                end = line.rfind(')')
-                value = line[start+1:end]
-                current_obj.properties[key] = value
+            start = line.find('(')
+            end = line.rfind(')')
+            if start != -1 and end != -1:
+                # 为每个 Pin 创建唯一的键名（计数保存在对象上，无需重新扫描已有属性）
+                current_obj.custom_pin_count += 1
+                key = f"CustomProperties Pin {current_obj.custom_pin_count}"
+                current_obj.properties[key] = line[start+1:end]
             return
         
-        # 处理多行属性（如 LinkedTo）
-        if 'LinkedTo=(' in line and ')' not in line:
-            # 这是多行属性的开始，暂时存储
-            # 注意：这里简化处理，实际项目中可能需要更复杂的多行处理
-            pass
-        
-        # 解析单行属性
-        prop_match = self.property_re.match(line)
-        if prop_match:
-            key, value = prop_match.groups()
-            current_obj.properties[key.strip()] = value.strip() 
\ No newline at end of file
+        # 解析单行属性：按第一个 '=' 切分为 键=值
+        # （键必须非空且只含单词字符和括号，单词字符即 Unicode 字母数字加下划线）
+        # 行已在 parse 中整体 strip：键不含空白，值只需去掉 '=' 后的前导空白
+        # 属性键在大量对象间高度重复（NodeGuid、NodePosX 等）：驻留后共享同一字符串，
+        # 下游以字面量查找时也可走指针相等快路径
+        key, sep, value = line.partition('=')
+        if sep and key and _is_property_key(key):
+            current_obj.properties[sys.intern(key)] = value.lstrip() 
\ No newline at end of file
@@ -5,7 +5,10 @@
 """
 
 # 导入基础类
-from .base import Formatter, FormattingStrategy, VerboseStrategy, ConciseStrategy
+from .base import (
+    Formatter, FormattingStrategy, VerboseStrategy, ConciseStrategy,
+    VERBOSE_STRATEGY, CONCISE_STRATEGY
+)
 
 # 导入具体的格式化器
 from .graph_formatter import MarkdownEventGraphFormatter, ASTVisitor
@@ -18,6 +21,8 @@ __all__ = [
     'FormattingStrategy', 
     'VerboseStrategy',
     'ConciseStrategy',
+    'VERBOSE_STRATEGY',
+    'CONCISE_STRATEGY',
     
     # Graph格式化器
     'MarkdownEventGraphFormatter',
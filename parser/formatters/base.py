@@ -4,7 +4,6 @@
 该模块定义了格式化器的基础接口和策略模式实现
 """
 
-from abc import ABC, abstractmethod
 from typing import Any
 
 
@@ -12,13 +11,12 @@ from typing import Any
 # 格式化器基础接口
 # ============================================================================
 
-class Formatter(ABC):
+class Formatter:
     """
     格式化器基础接口
-    所有具体的格式化器都应该继承此接口
+    所有具体的格式化器都应该继承此接口（普通基类，未覆盖的方法在调用时报错）
     """
     
-    @abstractmethod
     def format(self, data: Any) -> str:
         """
         格式化数据为字符串
@@ -26,45 +24,49 @@ class Formatter(ABC):
         :param data: 要格式化的数据
         :return: 格式化后的字符串
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.format not implemented")
 
 
 # ============================================================================
 # 格式化策略模式
 # ============================================================================
 
-class FormattingStrategy(ABC):
+# 各策略的缩进单位（模块级常量，策略每次返回同一个字符串对象）
+CONCISE_INDENT = "  "  # 2个空格
+VERBOSE_INDENT = "    "  # 4个空格
+
+
+class FormattingStrategy:
     """
     格式化策略基类
     定义格式化的通用行为接口
     """
     
-    @abstractmethod
+    __slots__ = ()
+    
     def get_indent_string(self) -> str:
         """
         获取缩进字符串
         
         :return: 缩进字符串
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.get_indent_string not implemented")
     
-    @abstractmethod
     def should_show_details(self) -> bool:
         """
         是否显示详细信息
         
         :return: True表示显示详细信息，False表示简洁模式
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.should_show_details not implemented")
     
-    @abstractmethod
     def should_show_type_info(self) -> bool:
         """
         是否显示类型信息
         
         :return: True表示显示类型信息，False表示不显示
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.should_show_type_info not implemented")
 
 
 class ConciseStrategy(FormattingStrategy):
@@ -73,9 +75,11 @@ class ConciseStrategy(FormattingStrategy):
     使用较少的缩进和简洁的输出格式
     """
     
+    __slots__ = ()
+    
     def get_indent_string(self) -> str:
         """返回简洁的缩进字符串"""
-        return "  "  # 2个空格
+        return CONCISE_INDENT
     
     def should_show_details(self) -> bool:
         """简洁模式不显示详细信息"""
@@ -92,9 +96,11 @@ class VerboseStrategy(FormattingStrategy):
     使用更多的缩进和详细的输出格式
     """
     
+    __slots__ = ()
+    
     def get_indent_string(self) -> str:
         """返回详细的缩进字符串"""
-        return "    "  # 4个空格
+        return VERBOSE_INDENT
     
     def should_show_details(self) -> bool:
         """详细模式显示详细信息"""
@@ -102,4 +108,9 @@ class VerboseStrategy(FormattingStrategy):
     
     def should_show_type_info(self) -> bool:
         """详细模式显示类型信息"""
-        return True 
\ No newline at end of file
+        return True
+
+
+# 策略无状态：模块级共享实例，格式化器默认直接复用
+CONCISE_STRATEGY = ConciseStrategy()
+VERBOSE_STRATEGY = VerboseStrategy()
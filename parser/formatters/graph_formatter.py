@@ -4,9 +4,10 @@ Graph格式化器模块
 该模块实现了EventGraph专用的Markdown格式化器，使用访问者模式将AST转换为结构化的伪代码输出
 """
 
-from abc import ABC, abstractmethod
+import io
+from functools import lru_cache
 from typing import Any
-from .base import Formatter, FormattingStrategy, ConciseStrategy
+from .base import Formatter, FormattingStrategy, CONCISE_STRATEGY
 from parser.models import (
     ASTNode, Expression, Statement,
     LiteralExpression, VariableGetExpression, FunctionCallExpression,
@@ -18,107 +19,153 @@ from parser.models import (
     # 新的语义节点
     VariableDeclaration, CallbackBlock,
     # 新增的AST节点
-    GenericCallNode, FallbackNode, EventSubscriptionNode
+    GenericCallNode, FallbackNode, EventSubscriptionNode,
+    EventReferenceExpression, LoopVariableExpression
 )
 
 
+# 预先生成的缩进字符串层数，更深的层级按需追加
+INDENT_CACHE_INITIAL_DEPTH = 32
+
+# 单次 format_ast 内复合表达式片段缓存的最大条目数，超出后整体清空
+EXPRESSION_CACHE_MAX_SIZE = 10000
+
+# 语句工作栈的动作类型：访问节点 / 展开执行块 / 调整缩进 / 输出一行
+WORK_VISIT = 0
+WORK_BLOCK = 1
+WORK_INDENT = 2
+WORK_LINE = 3
+
+# 字符串字面量格式化结果缓存的最大条目数
+STRING_LITERAL_CACHE_MAX_SIZE = 4096
+
+# AST节点类型 -> 访问方法名，格式化器内部递归按类型直接分派，省去 accept 的二次调用
+VISIT_METHOD_NAMES = {
+    LiteralExpression: "visit_literal_expression",
+    VariableGetExpression: "visit_variable_get_expression",
+    FunctionCallExpression: "visit_function_call_expression",
+    CastExpression: "visit_cast_expression",
+    TemporaryVariableExpression: "visit_temporary_variable_expression",
+    PropertyAccessNode: "visit_property_access",
+    EventReferenceExpression: "visit_event_reference_expression",
+    LoopVariableExpression: "visit_loop_variable_expression",
+    UnsupportedNode: "visit_unsupported_node",
+    ExecutionBlock: "visit_execution_block",
+    CallbackBlock: "visit_callback_block",
+    EventNode: "visit_event_node",
+    AssignmentNode: "visit_assignment_node",
+    FunctionCallNode: "visit_function_call_node",
+    BranchNode: "visit_branch_node",
+    LoopNode: "visit_loop_node",
+    LatentActionNode: "visit_latent_action_node",
+    TemporaryVariableDeclaration: "visit_temporary_variable_declaration",
+    VariableDeclaration: "visit_variable_declaration",
+    GenericCallNode: "visit_generic_call_node",
+    FallbackNode: "visit_fallback_node",
+    EventSubscriptionNode: "visit_event_subscription_node",
+}
+
+
+@lru_cache(maxsize=STRING_LITERAL_CACHE_MAX_SIZE)
+def _format_string_value(value: str) -> str:
+    """字符串字面量：UE资源路径格式化为简洁名称，其余加引号；字面量大量重复，结果按值缓存"""
+    # 检查是否是UE资源路径（先做 O(1) 的后缀检查，绝大多数普通字符串在此即被排除）
+    # e.g., /Game/BPs/UI/WBP_MyWidget.WBP_MyWidget_C
+    if value.endswith('_C') and value.startswith('/Game/') and '.' in value:
+        # 提取文件名部分并移除_C后缀
+        base_name = value.rpartition('.')[2]
+        return base_name.removesuffix('_C')
+
+    # 否则视为普通字符串
+    return f'"{value}"'
+
+
+# 字面量值类型 -> 格式化函数（按精确类型查表，未登记的类型走通用回退）
+LITERAL_VALUE_FORMATTERS = {
+    type(None): lambda value: "None",
+    bool: lambda value: "true" if value else "false",
+    int: str,
+    float: str,
+    str: _format_string_value,
+}
+
+
 # ============================================================================
 # 访问者模式基类（专用于EventGraph AST）
 # ============================================================================
 
-class ASTVisitor(ABC):
+class ASTVisitor:
     """
-    AST访问者模式的抽象基类
+    AST访问者模式的基类
     专门用于EventGraph AST的格式化，不再包含Widget相关方法
+    子类必须覆盖全部 visit_* 方法；使用普通基类而非 ABC，实例化无需检查抽象方法
     """
     
-    @abstractmethod
     def visit_literal_expression(self, node: LiteralExpression) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_literal_expression not implemented")
     
-    @abstractmethod
     def visit_variable_get_expression(self, node: VariableGetExpression) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_variable_get_expression not implemented")
     
-    @abstractmethod
     def visit_function_call_expression(self, node: FunctionCallExpression) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_function_call_expression not implemented")
     
-    @abstractmethod
     def visit_cast_expression(self, node: CastExpression) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_cast_expression not implemented")
     
-    @abstractmethod
     def visit_temporary_variable_expression(self, node: TemporaryVariableExpression) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_temporary_variable_expression not implemented")
     
-    @abstractmethod
     def visit_property_access(self, node: PropertyAccessNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_property_access not implemented")
     
-    @abstractmethod
     def visit_unsupported_node(self, node: UnsupportedNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_unsupported_node not implemented")
     
-    @abstractmethod
     def visit_execution_block(self, node: ExecutionBlock) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_execution_block not implemented")
     
-    @abstractmethod
     def visit_event_node(self, node: EventNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_event_node not implemented")
     
-    @abstractmethod
     def visit_assignment_node(self, node: AssignmentNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_assignment_node not implemented")
     
-    @abstractmethod
     def visit_function_call_node(self, node: FunctionCallNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_function_call_node not implemented")
     
-    @abstractmethod
     def visit_branch_node(self, node: BranchNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_branch_node not implemented")
     
-    @abstractmethod
     def visit_loop_node(self, node: LoopNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_loop_node not implemented")
     
-    @abstractmethod
     def visit_latent_action_node(self, node: LatentActionNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_latent_action_node not implemented")
     
-    @abstractmethod
     def visit_temporary_variable_declaration(self, node: TemporaryVariableDeclaration) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_temporary_variable_declaration not implemented")
     
-    @abstractmethod
     def visit_variable_declaration(self, node: VariableDeclaration) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_variable_declaration not implemented")
     
-    @abstractmethod
     def visit_callback_block(self, node: CallbackBlock) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_callback_block not implemented")
     
-    @abstractmethod
     def visit_event_reference_expression(self, node) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_event_reference_expression not implemented")
 
-    @abstractmethod
     def visit_loop_variable_expression(self, node) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_loop_variable_expression not implemented")
     
-    @abstractmethod
     def visit_generic_call_node(self, node: GenericCallNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_generic_call_node not implemented")
     
-    @abstractmethod
     def visit_fallback_node(self, node: FallbackNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_fallback_node not implemented")
     
-    @abstractmethod
     def visit_event_subscription_node(self, node: EventSubscriptionNode) -> str:
-        pass
+        raise NotImplementedError(f"{type(self).__name__}.visit_event_subscription_node not implemented")
 
 
 # ============================================================================
@@ -132,9 +179,42 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
     """
     
     def __init__(self, strategy: FormattingStrategy = None):
-        self.strategy = strategy or ConciseStrategy()
+        self.strategy = strategy or CONCISE_STRATEGY
+        # 策略在格式化器生命周期内不变：一次性取出其配置，访问方法中直接读属性
+        self._indent_unit = self.strategy.get_indent_string()
+        self._show_types = self.strategy.should_show_type_info()
         self.current_indent = 0
-        self.output_lines = []
+        # 按深度缓存缩进字符串，避免每行重新做字符串乘法
+        self._indent_cache = [self._indent_unit * depth for depth in range(INDENT_CACHE_INITIAL_DEPTH)]
+        # 输出缓冲区：逐行直接写入，避免累积大量小字符串后再统一 join
+        self._buf = io.StringIO()
+        # 节点类型 -> 已绑定访问方法；表外的类型（如节点子类）回退到 node.accept
+        self._dispatch = {
+            node_type: getattr(self, method_name)
+            for node_type, method_name in VISIT_METHOD_NAMES.items()
+        }
+        # 语句工作栈（后进先出）：嵌套执行块按动作入栈，由 _run_work 循环处理而不是递归
+        self._work = []
+        self._draining = False
+        # 复合表达式输出片段缓存：id(节点) -> (节点, 片段列表)；保存节点本身以校验身份，
+        # 避免已释放节点的 id 被复用后命中旧片段；format_ast 结束时清空
+        self._expr_cache = {}
+        # 可拆成片段直接输出的嵌套表达式
+        self._emitters = {
+            FunctionCallExpression: self._emit_function_call,
+            CastExpression: self._emit_cast,
+            PropertyAccessNode: self._emit_property_access,
+        }
+    
+    def reset(self) -> None:
+        """
+        清空单次格式化的状态，保留分派表与缩进缓存
+        同一实例可依次格式化多个AST（每次 format_ast 开始时自动调用）；实例本身不是线程安全的
+        """
+        self.current_indent = 0
+        self._buf = io.StringIO()
+        self._expr_cache.clear()
+        self._work = []
     
     def format(self, data: Any) -> str:
         """
@@ -155,25 +235,78 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
         :param ast_node: 要格式化的AST根节点
         :return: 格式化后的Markdown字符串
         """
-        self.current_indent = 0
-        self.output_lines = []
+        self.reset()
         
-        # 访问AST节点
-        result = ast_node.accept(self)
+        # 访问AST节点；片段缓存持有节点引用，结束后立即释放
+        try:
+            result = self._visit(ast_node)
+        finally:
+            self._expr_cache.clear()
         
-        if self.output_lines:
-            return '\n'.join(self.output_lines)
+        # 每行都以换行结尾：去掉最后一个换行即等价于按行 join
+        if self._buf.tell():
+            return self._buf.getvalue()[:-1]
         else:
             return result or ""
     
+    def _visit(self, node: ASTNode) -> str:
+        """按节点类型分派到访问方法；表外的类型回退到 node.accept"""
+        visit = self._dispatch.get(type(node))
+        if visit is None:
+            return node.accept(self)
+        return visit(node)
+    
+    def _schedule(self, items: list) -> None:
+        """按执行顺序给出的工作项逆序入栈，使其在栈中剩余工作之前依次执行"""
+        self._work.extend(reversed(items))
+    
+    def _schedule_indented_block(self, items: list, block: ExecutionBlock) -> None:
+        """追加 "缩进+1、执行块、缩进-1" 三个工作项"""
+        items.append((WORK_INDENT, 1))
+        items.append((WORK_BLOCK, block))
+        items.append((WORK_INDENT, -1))
+    
+    def _run_work(self) -> None:
+        """处理工作栈直到清空；已在处理循环中时直接返回，由外层循环继续"""
+        if self._draining:
+            return
+        self._draining = True
+        # 热循环：栈操作与访问方法绑定到局部变量
+        work = self._work
+        pop = work.pop
+        visit = self._visit
+        try:
+            while work:
+                action, arg = pop()
+                if action == WORK_VISIT:
+                    visit(arg)
+                elif action == WORK_BLOCK:
+                    work.extend([(WORK_VISIT, statement) for statement in reversed(arg.statements)])
+                elif action == WORK_INDENT:
+                    self.current_indent += arg
+                else:
+                    self._add_line(*arg)
+        finally:
+            self._draining = False
+    
     def _add_line(self, content: str, extra_indent: int = 0):
         """添加一行内容到输出"""
-        indent = self.strategy.get_indent_string() * (self.current_indent + extra_indent)
-        self.output_lines.append(f"{indent}{content}")
+        buf = self._buf
+        buf.write(self._indent(self.current_indent + extra_indent))
+        buf.write(content)
+        buf.write('\n')
     
     def _get_indent(self, extra_indent: int = 0) -> str:
         """获取当前缩进字符串"""
-        return self.strategy.get_indent_string() * (self.current_indent + extra_indent)
+        return self._indent(self.current_indent + extra_indent)
+    
+    def _indent(self, depth: int) -> str:
+        """返回指定深度的缩进字符串，超出缓存时按需扩展"""
+        cache = self._indent_cache
+        if depth >= len(cache):
+            indent_unit = self._indent_unit
+            cache.extend(indent_unit * d for d in range(len(cache), depth + 1))
+        return cache[depth]
 
     def _format_value(self, value: Any) -> str:
         """
@@ -182,22 +315,12 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
         - 格式化UE资源路径为简洁名称
         - 格式化普通字符串并加引号
         """
-        if value is None:
-            return "None"
-        if isinstance(value, bool):
-            return str(value).lower()
+        formatter = LITERAL_VALUE_FORMATTERS.get(type(value))
+        if formatter is not None:
+            return formatter(value)
         if not isinstance(value, str):
             return str(value)
-
-        # 检查是否是UE资源路径
-        # e.g., /Game/BPs/UI/WBP_MyWidget.WBP_MyWidget_C
-        if value.startswith('/Game/') and '.' in value and value.endswith('_C'):
-            # 提取文件名部分并移除_C后缀
-            base_name = value.split('.')[-1]
-            return base_name.removesuffix('_C')
-
-        # 否则视为普通字符串
-        return f'"{value}"'
+        return _format_string_value(value)
 
     # ========================================================================
     # 表达式节点访问方法
@@ -213,32 +336,15 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
     
     def visit_function_call_expression(self, node: FunctionCallExpression) -> str:
         """访问函数调用表达式"""
-        # 构建参数列表
-        args = []
-        for param_name, arg_expr in node.arguments:
-            if arg_expr:
-                arg_value = arg_expr.accept(self)
-                if param_name and param_name.lower() != "value":
-                    args.append(f"{param_name}: {arg_value}")
-                else:
-                    args.append(arg_value)
-        
-        args_str = ", ".join(args)
-        
-        # 构建函数调用
-        if node.target:
-            target_str = node.target.accept(self)
-            return f"{target_str}.{node.function_name}({args_str})"
-        else:
-            return f"{node.function_name}({args_str})"
+        out = []
+        self._emit_memoized(node, out, self._emit_function_call)
+        return "".join(out)
     
     def visit_cast_expression(self, node: CastExpression) -> str:
         """访问类型转换表达式"""
-        if node.source_expression:
-            source_str = node.source_expression.accept(self)
-            return f"cast({source_str} as {node.target_type})"
-        else:
-            return f"cast(<unknown> as {node.target_type})"
+        out = []
+        self._emit_memoized(node, out, self._emit_cast)
+        return "".join(out)
     
     def visit_temporary_variable_expression(self, node: TemporaryVariableExpression) -> str:
         """访问临时变量表达式"""
@@ -246,11 +352,9 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
     
     def visit_property_access(self, node: PropertyAccessNode) -> str:
         """格式化属性访问表达式"""
-        if node.target:
-            target_str = node.target.accept(self)
-            return f"{target_str}.{node.property_name}"
-        else:
-            return node.property_name
+        out = []
+        self._emit_memoized(node, out, self._emit_property_access)
+        return "".join(out)
     
     def visit_unsupported_node(self, node: UnsupportedNode) -> str:
         """格式化不支持的节点"""
@@ -263,8 +367,11 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
     
     def visit_execution_block(self, node: ExecutionBlock) -> str:
         """访问执行块"""
-        for statement in node.statements:
-            statement.accept(self)
+        # 空块（如只连了事件没有后续节点）无需经过工作栈
+        if not node.statements:
+            return ""
+        self._work.append((WORK_BLOCK, node))
+        self._run_work()
         return ""
     
     def visit_event_node(self, node: EventNode) -> str:
@@ -272,74 +379,48 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
         # 构建参数列表
         params_str = ""
         if node.parameters:
-            param_parts = []
-            for param_name, param_type in node.parameters:
-                if self.strategy.should_show_type_info():
-                    param_parts.append(f"{param_name}: {param_type}")
-                else:
-                    param_parts.append(param_name)
+            if self._show_types:
+                param_parts = [f"{param_name}: {param_type}" for param_name, param_type in node.parameters]
+            else:
+                param_parts = [param_name for param_name, _ in node.parameters]
             params_str = f"({', '.join(param_parts)})"
         
         # 添加事件声明
-        if hasattr(self, '_blueprint_title_added') and not self._blueprint_title_added:
-            self._add_line(f"#### Event: {node.event_name}{params_str}")
-            self._add_line("")
-            self._blueprint_title_added = True
-        else:
-            self._add_line(f"#### Event: {node.event_name}{params_str}")
-            self._add_line("")
+        self._add_line(f"#### Event: {node.event_name}{params_str}")
+        self._add_line("")
         
         # 处理事件体
         if node.body and node.body.statements:
-            self.current_indent += 1
-            self.visit_execution_block(node.body)
-            self.current_indent -= 1
+            items = []
+            self._schedule_indented_block(items, node.body)
+            self._schedule(items)
+            self._run_work()
         
         return ""
     
     def visit_assignment_node(self, node: AssignmentNode) -> str:
         """访问赋值节点"""
         if node.value_expression:
-            value_str = node.value_expression.accept(self)
+            value_str = self._visit(node.value_expression)
         else:
             value_str = "<unknown>"
         
-        # 处理新的target字段或向后兼容的variable_name
-        if hasattr(node, 'target') and node.target:
-            target_str = node.target.accept(self)
+        # target/operator 均为 AssignmentNode 的数据类字段，缺失目标时由 variable_name 给出占位名
+        if node.target:
+            target_str = self._visit(node.target)
         else:
             target_str = node.variable_name
         
-        # 使用新的operator字段，如果没有则默认使用"="
-        operator = getattr(node, 'operator', '=')
-        
         if node.is_local_variable:
             self._add_line(f"let {target_str} = {value_str}")
         else:
-            self._add_line(f"{target_str} {operator} {value_str}")
+            self._add_line(f"{target_str} {node.operator} {value_str}")
         
         return ""
     
     def visit_function_call_node(self, node: FunctionCallNode) -> str:
         """访问函数调用节点"""
-        # 构建参数列表
-        args = []
-        for param_name, arg_expr in node.arguments:
-            if arg_expr:
-                arg_value = arg_expr.accept(self)
-                if param_name and param_name.lower() != "value":
-                    args.append(f"{param_name}: {arg_value}")
-                else:
-                    args.append(arg_value)
-        
-        args_str = ", ".join(args)
-        
-        # 构建函数调用
-        if node.target:
-            target_str = node.target.accept(self)
-            call_str = f"{target_str}.{node.function_name}({args_str})"
-        else:
-            call_str = f"{node.function_name}({args_str})"
+        call_str = self._format_function_call_inline(node)
         
         # 处理返回值赋值
         if node.return_assignments:
@@ -353,33 +434,32 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
     def visit_branch_node(self, node: BranchNode) -> str:
         """访问分支节点"""
         if node.condition:
-            condition_str = node.condition.accept(self)
+            condition_str = self._visit(node.condition)
             self._add_line(f"if ({condition_str}):")
         else:
             self._add_line("if (<unknown condition>):")
         
+        items = []
         # 处理true分支
         if node.true_branch and node.true_branch.statements:
-            self.current_indent += 1
-            self.visit_execution_block(node.true_branch)
-            self.current_indent -= 1
+            self._schedule_indented_block(items, node.true_branch)
         else:
             self._add_line("// 空分支", 1)
         
         # 处理false分支
         if node.false_branch and node.false_branch.statements:
-            self._add_line("else:")
-            self.current_indent += 1
-            self.visit_execution_block(node.false_branch)
-            self.current_indent -= 1
+            items.append((WORK_LINE, ("else:",)))
+            self._schedule_indented_block(items, node.false_branch)
         
+        self._schedule(items)
+        self._run_work()
         return ""
     
     def visit_loop_node(self, node: LoopNode) -> str:
         """访问循环节点"""
         if node.loop_type == LoopType.FOR_EACH:
             if node.collection_expression:
-                collection_str = node.collection_expression.accept(self)
+                collection_str = self._visit(node.collection_expression)
             else:
                 collection_str = "<unknown collection>"
             
@@ -406,16 +486,17 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
         
         elif node.loop_type == LoopType.WHILE:
             if node.condition_expression:
-                condition_str = node.condition_expression.accept(self)
+                condition_str = self._visit(node.condition_expression)
                 self._add_line(f"while ({condition_str}):")
             else:
                 self._add_line("while (<unknown condition>):")
         
         # 处理循环体
         if node.body and node.body.statements:
-            self.current_indent += 1
-            self.visit_execution_block(node.body)
-            self.current_indent -= 1
+            items = []
+            self._schedule_indented_block(items, node.body)
+            self._schedule(items)
+            self._run_work()
         else:
             self._add_line("// 空循环体", 1)
         
@@ -431,71 +512,122 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
             self._add_line("await <unknown_latent_action>()")
         
         # 处理回调执行流
+        items = []
         for callback_name, callback_block in node.callback_exec_pins.items():
             if callback_block and callback_block.statements:
-                # 显示回调参数（如果有的话）
-                if hasattr(callback_block, 'declarations') and callback_block.declarations:
-                    param_names = [decl.variable_name for decl in callback_block.declarations]
+                # 显示回调参数（CallbackBlock.declarations 默认为空列表）
+                declarations = callback_block.declarations
+                if declarations:
+                    param_names = [decl.variable_name for decl in declarations]
                     param_str = f"({', '.join(param_names)})"
-                    self._add_line(f"// {callback_name}{param_str}:")
+                    items.append((WORK_LINE, (f"// {callback_name}{param_str}:",)))
                 else:
-                    self._add_line(f"// {callback_name}:")
+                    items.append((WORK_LINE, (f"// {callback_name}:",)))
                 
-                self.current_indent += 1
                 # 使用CallbackBlock的访问方法
-                if hasattr(callback_block, 'accept'):
-                    callback_block.accept(self)
-                else:
-                    # 向后兼容：直接访问statements
-                    self.visit_execution_block(callback_block)
-                self.current_indent -= 1
+                items.append((WORK_INDENT, 1))
+                items.append((WORK_VISIT, callback_block))
+                items.append((WORK_INDENT, -1))
         
+        self._schedule(items)
+        self._run_work()
         return ""
     
-    def _format_function_call_inline(self, node: FunctionCallNode) -> str:
-        """内联格式化函数调用（不添加到输出行）"""
-        # 构建参数列表
-        args = []
-        for param_name, arg_expr in node.arguments:
-            if arg_expr:
-                arg_value = arg_expr.accept(self)
-                if param_name and param_name.lower() != "value":
-                    args.append(f"{param_name}: {arg_value}")
-                else:
-                    args.append(arg_value)
-        
-        args_str = ", ".join(args)
-        
-        # 构建函数调用
+    def _format_function_call_inline(self, node) -> str:
+        """内联格式化函数调用语句（不添加到输出行）；参数与目标的输出逻辑与表达式共用 _emit_function_call"""
+        out = []
+        self._emit_function_call(node, out)
+        return "".join(out)
+    
+    # ========================================================================
+    # 表达式片段输出：嵌套表达式把片段追加到同一个列表，语句边界处只 join 一次
+    # ========================================================================
+    
+    def _emit_expr(self, node: ASTNode, out: list) -> None:
+        """把表达式片段追加到 out；没有专用输出方法的节点整体访问后追加"""
+        emit = self._emitters.get(type(node))
+        if emit is not None:
+            self._emit_memoized(node, out, emit)
+            return
+        out.append(self._visit(node))
+    
+    def _emit_memoized(self, node: Expression, out: list, emit) -> None:
+        """输出复合表达式片段；同一节点被多处引用时复用首次输出的片段"""
+        cache = self._expr_cache
+        key = id(node)
+        entry = cache.get(key)
+        if entry is not None and entry[0] is node:
+            out.extend(entry[1])
+            return
+        start = len(out)
+        emit(node, out)
+        if len(cache) >= EXPRESSION_CACHE_MAX_SIZE:
+            cache.clear()
+        cache[key] = (node, out[start:])
+    
+    def _emit_function_call(self, node, out: list) -> None:
+        """输出 target.Function(param: value, ...)；"value" 及无名参数只输出值"""
+        # 参数循环是格式化的最内层热点：方法预先绑定到局部变量
+        append = out.append
+        emit_expr = self._emit_expr
         if node.target:
-            target_str = node.target.accept(self)
-            return f"{target_str}.{node.function_name}({args_str})"
+            emit_expr(node.target, out)
+            append(".")
+        append(node.function_name)
+        append("(")
+        need_separator = False
+        for param_name, arg_expr in node.arguments:
+            if not arg_expr:
+                continue
+            if need_separator:
+                append(", ")
+            need_separator = True
+            # "value"（不区分大小写）只输出值；不缓存参数名（来自用户输入），精确命中时省去 lower()
+            if param_name and param_name != "value" and param_name.lower() != "value":
+                append(param_name)
+                append(": ")
+            emit_expr(arg_expr, out)
+        append(")")
+    
+    def _emit_cast(self, node: CastExpression, out: list) -> None:
+        """输出 cast(source as TargetType)"""
+        out.append("cast(")
+        if node.source_expression:
+            self._emit_expr(node.source_expression, out)
         else:
-            return f"{node.function_name}({args_str})"
+            out.append("<unknown>")
+        out.extend((" as ", node.target_type, ")"))
+    
+    def _emit_property_access(self, node: PropertyAccessNode, out: list) -> None:
+        """输出 target.property"""
+        if node.target:
+            self._emit_expr(node.target, out)
+            out.append(".")
+        out.append(node.property_name)
     
     def visit_temporary_variable_declaration(self, node: TemporaryVariableDeclaration) -> str:
         """访问临时变量声明"""
         if node.value_expression:
-            value_str = node.value_expression.accept(self)
-            if self.strategy.should_show_type_info() and node.variable_type:
+            value_str = self._visit(node.value_expression)
+            if self._show_types and node.variable_type:
                 self._add_line(f"declare {node.variable_name}: {node.variable_type} = {value_str}")
             else:
                 self._add_line(f"declare {node.variable_name} = {value_str}")
         else:
-            type_info = f": {node.variable_type}" if self.strategy.should_show_type_info() and node.variable_type else ""
+            type_info = f": {node.variable_type}" if self._show_types and node.variable_type else ""
             self._add_line(f"declare {node.variable_name}{type_info}")
         
         return ""
     
     def visit_variable_declaration(self, node: VariableDeclaration) -> str:
         """访问变量声明 - 移除declare关键字以简化输出"""
-        if self.strategy.should_show_type_info():
+        if self._show_types:
             type_info = f": {node.variable_type}" if node.variable_type and node.variable_type != "unknown" else ""
         else:
             type_info = ""
         
         if node.initial_value:
-            initial_value_str = node.initial_value.accept(self)
+            initial_value_str = self._visit(node.initial_value)
             # 移除declare关键字，直接使用赋值格式
             self._add_line(f"{node.variable_name}{type_info} = {initial_value_str}")
         else:
@@ -506,19 +638,14 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
     
     def visit_callback_block(self, node: CallbackBlock) -> str:
         """访问回调块"""
-        # 首先处理变量声明
-        for declaration in node.declarations:
-            declaration.accept(self)
-        
-        # 然后处理语句
-        for statement in node.statements:
-            statement.accept(self)
-        
+        # 首先处理变量声明，然后处理语句
+        self._schedule([(WORK_VISIT, child) for child in (*node.declarations, *node.statements)])
+        self._run_work()
         return ""
     
     def visit_event_reference_expression(self, node) -> str:
         """访问事件引用表达式"""
-        return node.event_name if hasattr(node, 'event_name') else "UnknownEvent"
+        return node.event_name
 
     def visit_loop_variable_expression(self, node) -> str:
         """访问循环变量表达式"""
@@ -529,16 +656,14 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
         # 构建函数调用格式：TargetObject.Function(param: Value)
         target_str = ""
         if node.target:
-            target_str = node.target.accept(self) + "."
+            target_str = self._visit(node.target) + "."
         
         # 构建参数列表
-        args_str = ""
-        if node.arguments:
-            arg_parts = []
-            for param_name, param_expr in node.arguments:
-                param_value = param_expr.accept(self) if param_expr else "null"
-                arg_parts.append(f"{param_name}: {param_value}")
-            args_str = ", ".join(arg_parts)
+        visit = self._visit
+        args_str = ", ".join([
+            f"{param_name}: {visit(param_expr) if param_expr else 'null'}"
+            for param_name, param_expr in node.arguments
+        ])
         
         function_call = f"{target_str}{node.function_name}({args_str})"
         self._add_line(function_call)
@@ -554,11 +679,8 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
         
         # 添加关键属性信息
         if node.properties:
-            prop_parts = []
-            for key, value in node.properties.items():
-                prop_parts.append(f"{key}={value}")
-            if prop_parts:
-                comment_parts.append(f" [{', '.join(prop_parts)}]")
+            props_str = ", ".join([f"{key}={value}" for key, value in node.properties.items()])
+            comment_parts.append(f" [{props_str}]")
         
         comment_line = "".join(comment_parts)
         self._add_line(comment_line)
@@ -568,18 +690,19 @@ class MarkdownEventGraphFormatter(ASTVisitor, Formatter):
         """访问事件订阅节点，格式化为 Source.Event += Handler 的形式"""
         # 构建事件源对象字符串
         if node.source_object:
-            source_str = node.source_object.accept(self)
+            source_str = self._visit(node.source_object)
         else:
             source_str = "<unknown>"
         
         # 构建事件处理器字符串
-        if node.handler:
-            handler_str = node.handler.accept(self)
+        handler = node.handler
+        if handler:
             # 处理特殊情况：如果处理器是 PropertyAccessNode 且属性名为 OutputDelegate，
             # 则只使用目标对象名称（即事件名称）
-            if hasattr(node.handler, 'property_name') and node.handler.property_name == "OutputDelegate":
-                if hasattr(node.handler, 'target'):
-                    handler_str = node.handler.target.accept(self)
+            if isinstance(handler, PropertyAccessNode) and handler.property_name == "OutputDelegate":
+                handler_str = self._visit(handler.target)
+            else:
+                handler_str = self._visit(handler)
         else:
             handler_str = "<unknown>"
         
@@ -1,12 +1,13 @@
 """
 Widget树格式化器模块
 
-该模块实现了用于格式化WidgetNode树的格式化器，支持递归层级展示和属性清理
+该模块实现了用于格式化WidgetNode树的格式化器，支持多层级展示和属性清理
 """
 
+import io
 import re
 from typing import List, Any, Tuple, Callable, Pattern
-from .base import Formatter, FormattingStrategy, ConciseStrategy
+from .base import Formatter, FormattingStrategy, CONCISE_STRATEGY
 from parser.models import WidgetNode
 
 
@@ -25,6 +26,16 @@ CLEANUP_STRATEGIES: List[Tuple[Pattern, Callable]] = [
     # 未来可在这里添加更多策略
 ]
 
+# 格式化时展示的Widget属性（按输出顺序）
+DISPLAYED_WIDGET_PROPERTIES: Tuple[str, ...] = (
+    "Text",
+    "Size",
+    "SizeBoxWidth",
+    "SizeBoxHeight",
+    "ButtonText",
+    "TextBorderPadding",
+)
+
 
 # ============================================================================
 # Widget树格式化器
@@ -33,7 +44,7 @@ CLEANUP_STRATEGIES: List[Tuple[Pattern, Callable]] = [
 class WidgetTreeFormatter(Formatter):
     """
     Widget树格式化器
-    使用递归遍历生成带层级缩进的Widget树结构
+    使用显式栈深度优先遍历生成带层级缩进的Widget树结构
     """
     
     def __init__(self, strategy: FormattingStrategy = None, show_properties: bool = False):
@@ -43,9 +54,13 @@ class WidgetTreeFormatter(Formatter):
         :param strategy: 格式化策略，默认使用ConciseStrategy
         :param show_properties: 是否显示Widget属性
         """
-        self.strategy = strategy or ConciseStrategy()
+        self.strategy = strategy or CONCISE_STRATEGY
         self.show_properties = show_properties
-        self.output_lines = []
+        # 按深度缓存缩进字符串，深度增加时按需追加
+        self._indent_unit = self.strategy.get_indent_string()
+        self._indent_cache = [""]
+        # 输出缓冲区：逐行直接写入，最后一次性取出
+        self._buf = io.StringIO()
     
     def format(self, data: Any) -> str:
         """
@@ -55,7 +70,7 @@ class WidgetTreeFormatter(Formatter):
         :return: 格式化后的Markdown字符串
         """
         # 重置输出缓冲区
-        self.output_lines = []
+        self._buf = io.StringIO()
         
         # 处理输入数据
         if isinstance(data, list):
@@ -82,8 +97,8 @@ class WidgetTreeFormatter(Formatter):
         elif widget_nodes:
             # 尝试从第一个节点推断蓝图名称
             first_node = widget_nodes[0]
-            if hasattr(first_node, 'source_location') and first_node.source_location:
-                blueprint_name = getattr(first_node.source_location, 'file_path', 'Widget Blueprint')
+            if first_node.source_location:
+                blueprint_name = first_node.source_location.file_path
                 if blueprint_name and blueprint_name != 'Blueprint':
                     self._add_line(f"# {blueprint_name} Hierarchy")
                 else:
@@ -95,33 +110,40 @@ class WidgetTreeFormatter(Formatter):
         
         self._add_line("")  # 空行分隔
         
-        # 递归格式化所有根节点
-        for root_node in widget_nodes:
-            self._format_node_recursive(root_node, 0)
-        
-        return '\n'.join(self.output_lines)
+        # 显式栈深度优先遍历：子节点逆序入栈以保持先序输出，深层嵌套不受递归深度限制
+        format_node = self._format_node
+        stack = [(0, root_node) for root_node in reversed(widget_nodes)]
+        pop = stack.pop
+        push_children = stack.extend
+        while stack:
+            depth, node = pop()
+            format_node(node, depth)
+            if node.children:
+                child_depth = depth + 1
+                push_children([(child_depth, child) for child in reversed(node.children)])
+        
+        # 每行都以换行结尾：去掉最后一个换行即等价于按行 join
+        return self._buf.getvalue()[:-1]
     
-    def _format_node_recursive(self, node: WidgetNode, depth: int):
+    def _format_node(self, node: WidgetNode, depth: int):
         """
-        递归格式化Widget节点
+        格式化单个Widget节点（不含子节点）
         
         :param node: 当前Widget节点
         :param depth: 当前缩进深度
         """
-        # 生成缩进
-        indent = self.strategy.get_indent_string() * depth
-        
-        # 格式化节点基本信息
-        node_line = f"{indent}- **{node.widget_name}** ({node.widget_type})"
-        self._add_line(node_line)
+        # 格式化节点基本信息：缩进与各片段直接写入输出缓冲区，不拼接整行
+        buf = self._buf
+        buf.write(self._indent(depth))
+        buf.write("- **")
+        buf.write(node.widget_name)
+        buf.write("** (")
+        buf.write(node.widget_type)
+        buf.write(")\n")
         
         # 如果需要显示属性，则格式化属性信息
         if self.show_properties:
             self._format_node_properties(node, depth)
-        
-        # 递归处理所有子节点
-        for child in node.children:
-            self._format_node_recursive(child, depth + 1)
     
     def _format_node_properties(self, node: WidgetNode, depth: int):
         """
@@ -130,28 +152,27 @@ class WidgetTreeFormatter(Formatter):
         :param node: Widget节点
         :param depth: 当前缩进深度
         """
-        # 定义需要显示的属性
-        properties_to_show = {
-            "Text": node.properties.get("Text"),
-            "Size": node.properties.get("Size"),
-            "SizeBoxWidth": node.properties.get("SizeBoxWidth"),
-            "SizeBoxHeight": node.properties.get("SizeBoxHeight"),
-            "ButtonText": node.properties.get("ButtonText"),
-            "TextBorderPadding": node.properties.get("TextBorderPadding"),
-        }
-        
-        # 过滤掉空值并格式化
-        formatted_props = []
-        for key, value in properties_to_show.items():
-            if value is not None and str(value).strip():
-                cleaned_value = self._clean_property_value(value)
-                if cleaned_value and cleaned_value.strip():  # 只显示有意义的属性值
-                    prop_indent = self.strategy.get_indent_string() * (depth + 1)
-                    formatted_props.append(f"{prop_indent}- {key}: `{cleaned_value}`")
-        
-        # 添加属性到输出
-        for prop in formatted_props:
-            self._add_line(prop)
+        # 过滤掉空值并格式化，属性行按片段直接写入输出缓冲区
+        properties = node.properties
+        if not properties:
+            return
+        buf = self._buf
+        prop_indent = None
+        for key in DISPLAYED_WIDGET_PROPERTIES:
+            value = properties.get(key)
+            if value is None:
+                continue
+            # 清理结果已是字符串：空白值在清理后同样被过滤，无需预先 str(value).strip()
+            cleaned_value = self._clean_property_value(value)
+            if cleaned_value and cleaned_value.strip():  # 只显示有意义的属性值
+                if prop_indent is None:
+                    prop_indent = self._indent(depth + 1)
+                buf.write(prop_indent)
+                buf.write("- ")
+                buf.write(key)
+                buf.write(": `")
+                buf.write(cleaned_value)
+                buf.write("`\n")
     
     def _clean_property_value(self, value: Any) -> str:
         """
@@ -183,10 +204,19 @@ class WidgetTreeFormatter(Formatter):
         
         return value
     
+    def _indent(self, depth: int) -> str:
+        """返回指定深度的缩进字符串（逐级复用上一层结果）"""
+        cache = self._indent_cache
+        while len(cache) <= depth:
+            cache.append(cache[-1] + self._indent_unit)
+        return cache[depth]
+    
     def _add_line(self, content: str):
         """
         添加一行内容到输出缓冲区
         
         :param content: 要添加的内容
         """
-        self.output_lines.append(content) 
\ No newline at end of file
+        buf = self._buf
+        buf.write(content)
+        buf.write('\n') 
\ No newline at end of file
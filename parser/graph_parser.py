@@ -1,10 +1,28 @@
 import re
+from collections import Counter
 from typing import List, Dict, Optional
 from .models import GraphPin, GraphNode, BlueprintGraph, RawObject
 from .common.object_parser import BlueprintObjectParser
-from .common.builder_utils import collect_all_raw_objects
+from .common.builder_utils import collect_all_raw_objects, extract_blueprint_path
+from .common.graph_utils import extract_macro_name
 import uuid
 
+# 引脚解析用的模块级预编译正则表达式（每个引脚属性都会经过这些匹配）
+PIN_ID_RE = re.compile(r'PinId=([A-F0-9-]+)')
+PIN_NAME_RE = re.compile(r'PinName="([^"]+)"')
+PIN_CATEGORY_RE = re.compile(r'PinType\.PinCategory="([^"]+)"')
+DEFAULT_VALUE_RE = re.compile(r'DefaultValue="((?:[^"\\]|\\.)*)"')
+DEFAULT_OBJECT_RE = re.compile(r'DefaultObject="([^"]*)"')
+LINKED_TO_RE = re.compile(r'LinkedTo=\(([^)]+)\)')
+INLINE_LINK_RE = re.compile(r'(\w+)\s+([A-F0-9-]+)')
+GUID_RE = re.compile(r'([A-F0-9-]+)')
+OBJECT_LINK_RE = re.compile(r'NodeGuid=([A-F0-9-]+),PinId=([A-F0-9-]+)')
+
+# 蓝图名称提取用的模块级预编译正则表达式
+EXPORT_ASSET_NAME_RE = re.compile(r"/([^/]+)\.([^'\"]+)$")
+ROOT_WIDGET_CLASS_RE = re.compile(r"'([^']+)_C'")
+GAME_ASSET_REF_RE = re.compile(r"/Game/[^'\"]*?/([^/'\"]+)\.([^'\"]+)")
+
 # 生成唯一 GUID
 _defalt_guid_counter = 0
 
@@ -85,8 +103,12 @@ class GraphBuilder:
         
         for obj in graph_objects:
             # 创建基本的 GraphNode
+            # 临时 GUID 只在缺少 NodeGuid 时生成，避免每个节点都做一次计数和格式化
+            node_guid = obj.properties.get("NodeGuid")
+            if node_guid is None:
+                node_guid = _generate_temp_guid()
             node = GraphNode(
-                node_guid=obj.properties.get("NodeGuid", _generate_temp_guid()),
+                node_guid=node_guid,
                 node_name=obj.name,
                 class_type=obj.class_type,
                 properties=obj.properties.copy()
@@ -108,6 +130,10 @@ class GraphBuilder:
             # 解析引脚（从 CustomProperties Pin 或子对象中）
             node.pins = self._extract_pins_for_node(obj)
             
+            # 宏节点预先提取宏名称，后续分发直接读取缓存
+            if node.short_type == "K2Node_MacroInstance":
+                extract_macro_name(node)
+            
             nodes.append(node)
         
         return nodes
@@ -135,13 +161,13 @@ class GraphBuilder:
     def _parse_inline_pin_from_property(self, prop_value: str) -> Optional[GraphPin]:
         """从属性值解析内联引脚"""
         # 提取PinId
-        pin_id_match = re.search(r'PinId=([A-F0-9-]+)', prop_value)
+        pin_id_match = PIN_ID_RE.search(prop_value)
         if not pin_id_match:
             return None
         pin_id = pin_id_match.group(1)
         
         # 提取PinName
-        pin_name_match = re.search(r'PinName="([^"]+)"', prop_value)
+        pin_name_match = PIN_NAME_RE.search(prop_value)
         pin_name = pin_name_match.group(1) if pin_name_match else "unknown"
         
         # 提取引脚方向
@@ -150,19 +176,19 @@ class GraphBuilder:
             direction = "output"
         
         # 提取引脚类型
-        pin_type_match = re.search(r'PinType\.PinCategory="([^"]+)"', prop_value)
+        pin_type_match = PIN_CATEGORY_RE.search(prop_value)
         pin_type = pin_type_match.group(1) if pin_type_match else "unknown"
         
         # 提取默认值
         default_value = None
-        default_match = re.search(r'DefaultValue="((?:[^"\\]|\\.)*)"', prop_value)
+        default_match = DEFAULT_VALUE_RE.search(prop_value)
         if default_match:
             raw_value = default_match.group(1)
             default_value = raw_value.replace('\\"', '"').replace('\\\\', '\\')
         
         # 提取默认对象路径（用于K2Node_CreateWidget等节点）
         default_object = None
-        default_object_match = re.search(r'DefaultObject="([^"]*)"', prop_value)
+        default_object_match = DEFAULT_OBJECT_RE.search(prop_value)
         if default_object_match:
             default_object = default_object_match.group(1)
         
@@ -177,7 +203,7 @@ class GraphBuilder:
         )
         
         # 解析连接信息
-        linked_match = re.search(r'LinkedTo=\(([^)]+)\)', prop_value)
+        linked_match = LINKED_TO_RE.search(prop_value)
         if linked_match:
             links_str = linked_match.group(1)
             self._parse_linked_to_inline(pin, links_str)
@@ -187,7 +213,7 @@ class GraphBuilder:
     def _parse_linked_to_inline(self, pin: GraphPin, links_str: str):
         """解析内联格式的连接信息"""
         # 尝试新格式：K2Node_Event_0 AD580DCB422E368B8945BFBB2B710ECC,
-        link_parts = re.findall(r'(\w+)\s+([A-F0-9-]+)', links_str)
+        link_parts = INLINE_LINK_RE.findall(links_str)
         if link_parts:
             for node_name, pin_id in link_parts:
                 pin.linked_to.append({
@@ -196,7 +222,7 @@ class GraphBuilder:
                 })
         else:
             # 回退到旧格式：只有引脚ID
-            guid_parts = re.findall(r'([A-F0-9-]+)', links_str)
+            guid_parts = GUID_RE.findall(links_str)
             for target_pin_id in guid_parts:
                 if target_pin_id:  # 确保不是空字符串
                     pin.linked_to.append({
@@ -253,7 +279,7 @@ class GraphBuilder:
             linked_to_str = linked_to_str[1:-1]
         
         # 解析连接信息
-        link_parts = re.findall(r'NodeGuid=([A-F0-9-]+),PinId=([A-F0-9-]+)', linked_to_str)
+        link_parts = OBJECT_LINK_RE.findall(linked_to_str)
         for node_guid, pin_id in link_parts:
             pin.linked_to.append({
                 "node_guid": node_guid,
@@ -370,10 +396,10 @@ class GraphBuilder:
             
             # ExportPath格式: ".../WBP_AbilitiesMenu.WBP_AbilitiesMenu:EventGraph.K2Node_Event_0'"
             # 提取冒号前的部分
-            blueprint_part = export_path.split(":")[0]
+            blueprint_part = export_path.partition(":")[0]
             
             # 提取最后一个路径段中的资产名
-            match = re.search(r"/([^/]+)\.([^'\"]+)$", blueprint_part)
+            match = EXPORT_ASSET_NAME_RE.search(blueprint_part)
             if match:
                 folder_name = match.group(1)
                 asset_name = match.group(2)
@@ -390,7 +416,7 @@ class GraphBuilder:
                 root_widget = obj.properties.get("RootWidget", "")
                 if root_widget:
                     # 格式: "WidgetBlueprint'WBP_Name_C'"
-                    match = re.search(r"'([^']+)_C'", root_widget)
+                    match = ROOT_WIDGET_CLASS_RE.search(root_widget)
                     if match:
                         return match.group(1)
         
@@ -398,8 +424,6 @@ class GraphBuilder:
     
     def _extract_by_frequency(self, raw_objects: List[RawObject]) -> str:
         """基于频率分析的智能名称提取"""
-        from collections import Counter
-        
         # 收集所有可能的蓝图名称
         candidates = []
         
@@ -409,9 +433,10 @@ class GraphBuilder:
                 if prop_key.startswith("CustomProperties Pin"):
                     continue
                 
-                if isinstance(prop_value, str):
+                # 不含 "/Game/" 的属性值不可能匹配，先用子串检查排除
+                if isinstance(prop_value, str) and "/Game/" in prop_value:
                     # 查找所有路径格式的资产引用
-                    matches = re.findall(r"/Game/[^'\"]*?/([^/'\"]+)\.([^'\"]+)", prop_value)
+                    matches = GAME_ASSET_REF_RE.findall(prop_value)
                     for folder_name, asset_name in matches:
                         # 清理后缀
                         clean_name = asset_name.replace("_C", "")
@@ -482,15 +507,14 @@ def parse_blueprint_graph(graph_text: str, graph_name: str = "EventGraph") -> Op
     if not graph_text or not graph_text.strip():
         return None
     
-    # 第一阶段：使用通用解析器解析文本
-    object_parser = BlueprintObjectParser()
-    raw_objects = object_parser.parse(graph_text)
+    # 第一阶段：使用构建器自带的通用解析器解析文本（每次调用只创建一个解析器）
+    graph_builder = GraphBuilder()
+    raw_objects = graph_builder.object_parser.parse(graph_text)
     
     if not raw_objects:
         return None
     
     # 第二阶段：使用 Graph 构建器构建 BlueprintGraph
-    graph_builder = GraphBuilder()
     return graph_builder.build(raw_objects, graph_name)
 
 
@@ -510,9 +534,9 @@ def parse_blueprint_graph_v2(graph_text: str, graph_name: str = "EventGraph") ->
         )
     
     try:
-        # 第一阶段：使用通用解析器解析文本
-        object_parser = BlueprintObjectParser()
-        raw_objects = object_parser.parse(graph_text)
+        # 第一阶段：使用构建器自带的通用解析器解析文本（每次调用只创建一个解析器）
+        graph_builder = GraphBuilder()
+        raw_objects = graph_builder.object_parser.parse(graph_text)
         
         if not raw_objects:
             return BlueprintParseResult(
@@ -523,8 +547,7 @@ def parse_blueprint_graph_v2(graph_text: str, graph_name: str = "EventGraph") ->
                 error_message="无法解析蓝图文本格式"
             )
         
-        # 第二阶段：使用 Graph 构建器构建 BlueprintGraph
-        graph_builder = GraphBuilder()
+        # 第二阶段：复用同一个 Graph 构建器构建 BlueprintGraph
         graph = graph_builder.build(raw_objects, graph_name)
         
         if not graph:
@@ -540,10 +563,7 @@ def parse_blueprint_graph_v2(graph_text: str, graph_name: str = "EventGraph") ->
         blueprint_name = graph.graph_name.split(" ")[0] if " " in graph.graph_name else graph.graph_name
         
         # 尝试提取完整路径
-        blueprint_path = ""
-        path_match = re.search(r"/Game/[^'\"]+\.([^'\"]+)", graph_text)
-        if path_match:
-            blueprint_path = path_match.group(0)
+        blueprint_path = extract_blueprint_path(graph_text)
         
         return BlueprintParseResult(
             blueprint_name=blueprint_name,
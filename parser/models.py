@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Tuple, Union, TYPE_CHECKING
 from abc import ABC, abstractmethod
 from enum import Enum
+from functools import lru_cache
+import sys
 import weakref
 
 # 避免循环导入
@@ -9,11 +11,21 @@ if TYPE_CHECKING:
     from .symbol_table import Scope
 
 
+# 节点类型名来自很小的重复词表，去前缀结果按类型名缓存
+SHORT_TYPE_CACHE_MAX_SIZE = 512
+
+
+@lru_cache(maxsize=SHORT_TYPE_CACHE_MAX_SIZE)
+def _short_type_name(class_type: str) -> str:
+    """去除命名空间前缀并驻留，如 /Script/BlueprintGraph.K2Node_Knot -> K2Node_Knot"""
+    return sys.intern(class_type.rpartition('.')[2])
+
+
 # ============================================================================
 # 通用解析中间结构 (Common Parsing Intermediate Structure)
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class RawObject:
     """
     通用蓝图对象的中间表示
@@ -23,9 +35,16 @@ class RawObject:
     class_type: str                                     # 对象类型
     properties: Dict[str, str] = field(default_factory=dict)  # 属性键值对
     children: List['RawObject'] = field(default_factory=list)  # 子对象列表
+    is_slot: bool = field(init=False, repr=False, compare=False)  # 是否为 Slot/WidgetSlotPair 对象（预计算）
+    custom_pin_count: int = field(init=False, default=0, repr=False, compare=False)  # 已登记的 CustomProperties Pin 数量
+    
+    def __post_init__(self):
+        # 类型名来自很小的重复词表：驻留后哈希/比较更快，并一次性预计算 Slot 判定
+        self.class_type = sys.intern(self.class_type)
+        self.is_slot = "Slot" in self.class_type or "WidgetSlotPair" in self.class_type
 
 
-@dataclass
+@dataclass(slots=True)
 class BlueprintNode:
     """
     代表一个UE蓝图中的节点，例如一个Widget控件或一个Slot。
@@ -38,7 +57,7 @@ class BlueprintNode:
     has_parent: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphPin:
     """
     代表蓝图Graph节点的引脚信息
@@ -51,6 +70,13 @@ class GraphPin:
     linked_to: List[Dict[str, str]] = field(default_factory=list)  # 连接到的其他引脚信息 [{"node_guid": "", "pin_id": ""}]
     default_value: Optional[str] = None  # 引脚的默认值
     default_object: Optional[str] = None  # 引脚的默认对象路径（用于K2Node_CreateWidget等节点）
+    bHidden: bool = False  # 引脚是否在编辑器中隐藏
+    
+    def __post_init__(self):
+        # 名称/方向/类型来自很小的重复词表：驻留后与字面量比较可走指针相等快路径
+        self.pin_name = sys.intern(self.pin_name)
+        self.direction = sys.intern(self.direction)
+        self.pin_type = sys.intern(self.pin_type)
 
 
 @dataclass
@@ -58,6 +84,9 @@ class GraphNode:
     """
     代表蓝图Graph中的单个节点
     专门用于处理Graph逻辑的节点结构
+    
+    引脚派生视图（get_pin、data_input_pins 等）按需缓存：整体替换 pins 列表或改变其长度会自动重建，
+    原地替换元素（node.pins[i] = ...）或修改引脚的名称/方向/类型后须调用 invalidate_pin_views()
     """
     node_guid: str
     node_name: str
@@ -69,6 +98,67 @@ class GraphNode:
     # 用于图遍历的连接引用
     input_connections: Dict[str, 'GraphNode'] = field(default_factory=dict)  # pin_id -> 连接的源节点
     output_connections: Dict[str, List['GraphNode']] = field(default_factory=dict)  # pin_id -> 连接的目标节点列表
+    # 去除命名空间前缀后的驻留类型名，如 "/Script/BlueprintGraph.K2Node_Knot" -> "K2Node_Knot"
+    short_type: str = field(init=False, repr=False, compare=False)
+    # 引脚派生视图缓存：(来源引脚列表, 列表长度, (名称, 方向)->引脚索引, 非执行输入引脚, 非执行输出引脚, 是否有执行引脚)
+    _pin_views: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # 宏名称缓存，由 extract_macro_name 首次提取时写入（宏节点在构建阶段预先填充）
+    macro_name: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # 引用提取结果缓存，由 graph_utils 中对应的 extract_* 函数首次调用时写入
+    function_reference: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    variable_reference: Optional[Tuple[str, bool]] = field(default=None, init=False, repr=False, compare=False)
+    event_name: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """构建时一次性规范化类型名，避免各处重复处理 "/Script/..." 前缀"""
+        self.short_type = _short_type_name(self.class_type)
+    
+    def _get_pin_views(self) -> tuple:
+        """单次遍历构建引脚索引、划分非执行引脚并记录是否存在执行引脚；pins 被替换或长度变化时重新计算"""
+        pins = self.pins
+        views = self._pin_views
+        if views is None or views[0] is not pins or views[1] != len(pins):
+            pin_index: Dict[Tuple[str, str], GraphPin] = {}
+            inputs = []
+            outputs = []
+            has_exec = False
+            for pin in pins:
+                # 同名同方向的引脚保留第一个，与线性查找的结果一致
+                pin_index.setdefault((pin.pin_name, pin.direction), pin)
+                if pin.pin_type != "exec":
+                    if pin.direction == "input":
+                        inputs.append(pin)
+                    elif pin.direction == "output":
+                        outputs.append(pin)
+                else:
+                    has_exec = True
+            views = (pins, len(pins), pin_index, tuple(inputs), tuple(outputs), has_exec)
+            self._pin_views = views
+        return views
+    
+    def invalidate_pin_views(self) -> None:
+        """丢弃引脚派生视图缓存，下次访问时按当前 pins 重建"""
+        self._pin_views = None
+    
+    def pin_index(self) -> Dict[Tuple[str, str], GraphPin]:
+        """返回 (名称, 方向) -> 引脚 的索引，供需要连续多次查找的调用方复用"""
+        return self._get_pin_views()[2]
+    
+    def get_pin(self, pin_name: str, direction: str) -> Optional[GraphPin]:
+        """按名称和方向查找引脚（字典查找）"""
+        return self._get_pin_views()[2].get((pin_name, direction))
+    
+    def data_input_pins(self) -> Tuple[GraphPin, ...]:
+        """按原始顺序返回所有非执行输入引脚"""
+        return self._get_pin_views()[3]
+    
+    def data_output_pins(self) -> Tuple[GraphPin, ...]:
+        """按原始顺序返回所有非执行输出引脚"""
+        return self._get_pin_views()[4]
+    
+    def has_exec_pins(self) -> bool:
+        """是否存在执行引脚（随引脚视图一并缓存）"""
+        return self._get_pin_views()[5]
 
 
 @dataclass
@@ -200,6 +290,12 @@ class WidgetNode(ASTNode):
     widget_type: str = ""  # Widget类型（如Button, TextBlock等）
     properties: Dict[str, Any] = field(default_factory=dict)  # Widget属性
     children: List['WidgetNode'] = field(default_factory=list)  # 子Widget节点
+    has_parent: bool = field(default=False, repr=False, compare=False)  # 是否已被挂到某个父Widget下
+    _child_ids: set = field(init=False, repr=False, compare=False)  # children 的 id 集合，O(1) 去重
+    
+    def __post_init__(self):
+        # 构造时传入的子节点也纳入去重集合
+        self._child_ids = {id(child) for child in self.children}
     
     def accept(self, visitor):
         """访问者模式的accept方法"""
@@ -207,7 +303,10 @@ class WidgetNode(ASTNode):
     
     def add_child(self, child: 'WidgetNode'):
         """添加子Widget节点"""
-        if child not in self.children:
+        child.has_parent = True
+        child_id = id(child)
+        if child_id not in self._child_ids:
+            self._child_ids.add(child_id)
             self.children.append(child)
     
     def find_child_by_name(self, name: str) -> Optional['WidgetNode']:
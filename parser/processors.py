@@ -21,9 +21,12 @@ from .common import (
     extract_variable_reference, extract_function_reference, 
     find_then_pin, find_else_pin, find_pin_by_aliases,
     has_execution_pins, extract_macro_name, node_processor_registry,
-    parse_object_path
+    parse_object_path, PROCESSOR_KIND_EXPR, PROCESSOR_KIND_STMT, PROCESSOR_KIND_BOTH
 )
 
+# 委托节点在缺少 "Delegate" 引脚连接时可作为处理器来源的引脚名（小写）
+_DELEGATE_HANDLER_PIN_NAMES = frozenset({"delegate", "value", "event"})
+
 
 # ============================================================================
 # 事件节点处理器
@@ -32,7 +35,8 @@ from .common import (
 @register_processor(
     "K2Node_Event", 
     "K2Node_CustomEvent", 
-    "K2Node_ComponentBoundEvent"
+    "K2Node_ComponentBoundEvent",
+    kind=PROCESSOR_KIND_STMT
 )
 def process_generic_event_node(analyzer, context, node) -> Optional[EventNode]:
     """
@@ -68,7 +72,8 @@ def process_generic_event_node(analyzer, context, node) -> Optional[EventNode]:
 # ============================================================================
 
 @register_processor(
-    "K2Node_VariableSet"
+    "K2Node_VariableSet",
+    kind=PROCESSOR_KIND_STMT
 )
 def process_variable_set(analyzer, context, node) -> Optional[AssignmentNode]:
     """
@@ -83,10 +88,9 @@ def process_variable_set(analyzer, context, node) -> Optional[AssignmentNode]:
     value_pin = find_pin(node, var_name, "input")
     if not value_pin:
         # 尝试查找任何非exec的输入引脚
-        for pin in node.pins:
-            if pin.direction == "input" and pin.pin_type != "exec":
-                value_pin = pin
-                break
+        data_inputs = node.data_input_pins()
+        if data_inputs:
+            value_pin = data_inputs[0]
     
     # 解析值表达式
     value_expr = analyzer._resolve_data_expression(context, value_pin) if value_pin else LiteralExpression(
@@ -161,7 +165,8 @@ def process_variable_set(analyzer, context, node) -> Optional[AssignmentNode]:
 # ============================================================================
 
 @register_processor(
-    "K2Node_IfThenElse"
+    "K2Node_IfThenElse",
+    kind=PROCESSOR_KIND_STMT
 )
 def process_if_then_else(analyzer, context, node) -> Optional[BranchNode]:
     """
@@ -195,7 +200,8 @@ def process_if_then_else(analyzer, context, node) -> Optional[BranchNode]:
 
 
 @register_processor(
-    "K2Node_ExecutionSequence"
+    "K2Node_ExecutionSequence",
+    kind=PROCESSOR_KIND_STMT
 )
 def process_execution_sequence(analyzer, context, node) -> Optional[ExecutionBlock]:
     """
@@ -225,7 +231,8 @@ def process_execution_sequence(analyzer, context, node) -> Optional[ExecutionBlo
 # ============================================================================
 
 @register_processor(
-    "K2Node_Knot"
+    "K2Node_Knot",
+    kind=PROCESSOR_KIND_STMT
 )
 def process_knot_node(analyzer, context, node) -> Optional[ASTNode]:
     """
@@ -236,7 +243,8 @@ def process_knot_node(analyzer, context, node) -> Optional[ASTNode]:
 
 
 @register_processor(
-    "K2Node_DynamicCast"
+    "K2Node_DynamicCast",
+    kind=PROCESSOR_KIND_STMT
 )
 def process_dynamic_cast(analyzer, context, node) -> Optional[BranchNode]:
     """
@@ -310,7 +318,7 @@ def process_dynamic_cast(analyzer, context, node) -> Optional[BranchNode]:
 # 简单表达式处理器
 # ============================================================================
 
-@register_processor("K2Node_Literal")
+@register_processor("K2Node_Literal", kind=PROCESSOR_KIND_EXPR)
 def process_literal_node(analyzer, context, node) -> Optional[LiteralExpression]:
     """
     处理字面量节点
@@ -323,7 +331,7 @@ def process_literal_node(analyzer, context, node) -> Optional[LiteralExpression]
     )
 
 
-@register_processor("K2Node_MathExpression")
+@register_processor("K2Node_MathExpression", kind=PROCESSOR_KIND_EXPR)
 def process_math_expression_node(analyzer, context, node) -> Optional[FunctionCallExpression]:
     """
     处理数学表达式节点
@@ -341,7 +349,7 @@ def process_math_expression_node(analyzer, context, node) -> Optional[FunctionCa
     )
 
 
-@register_processor("K2Node_ArrayGet")
+@register_processor("K2Node_ArrayGet", kind=PROCESSOR_KIND_EXPR)
 def process_array_access_node(analyzer, context, node) -> Optional[FunctionCallExpression]:
     """
     处理数组访问节点
@@ -365,7 +373,7 @@ def process_array_access_node(analyzer, context, node) -> Optional[FunctionCallE
 # 宏处理器
 # ============================================================================
 
-@register_processor("K2Node_MacroInstance:ForEachLoop")
+@register_processor("K2Node_MacroInstance:ForEachLoop", kind=PROCESSOR_KIND_STMT)
 def process_foreach_macro(analyzer, context, node) -> NodeProcessingResult:
     """
     处理ForEach宏 - 使用ScopeManager精确管理循环变量作用域
@@ -448,7 +456,7 @@ def process_foreach_macro(analyzer, context, node) -> NodeProcessingResult:
     return NodeProcessingResult(node=loop_node, continuation_pin=completed_pin)
 
 
-@register_processor("K2Node_MacroInstance:WhileLoop")
+@register_processor("K2Node_MacroInstance:WhileLoop", kind=PROCESSOR_KIND_STMT)
 def process_while_macro(analyzer, context, node) -> Optional[LoopNode]:
     """
     处理While宏
@@ -475,7 +483,7 @@ def process_while_macro(analyzer, context, node) -> Optional[LoopNode]:
     return loop_node
 
 
-@register_processor("K2Node_MacroInstance")
+@register_processor("K2Node_MacroInstance", kind=PROCESSOR_KIND_STMT)
 def process_generic_macro(analyzer, context, node) -> Optional[FunctionCallNode]:
     """
     处理通用宏（作为函数调用）
@@ -497,11 +505,13 @@ def process_generic_macro(analyzer, context, node) -> Optional[FunctionCallNode]
         display_macro_name = "UnknownMacro"
     
     # 简化宏名称用于显示
-    if isinstance(display_macro_name, str) and "'" in display_macro_name:
-        display_macro_name = display_macro_name.split("'")[-2].split(".")[-1] if "." in display_macro_name else display_macro_name
+    if isinstance(display_macro_name, str) and "'" in display_macro_name and "." in display_macro_name:
+        # 取最后一对引号之间的路径，再取最后一个 "." 之后的部分（rpartition 不构造中间列表）
+        quoted_path = display_macro_name.rpartition("'")[0].rpartition("'")[2]
+        display_macro_name = quoted_path.rpartition(".")[2]
     
     # 解析参数
-    arguments = analyzer._parse_function_arguments(context, node, {"self"})
+    arguments = analyzer._parse_function_arguments(context, node)
     
     return FunctionCallNode(
         target=None,
@@ -517,7 +527,8 @@ def process_generic_macro(analyzer, context, node) -> Optional[FunctionCallNode]
 
 @register_processor(
     "K2Node_AddDelegate",
-    "K2Node_AssignDelegate"
+    "K2Node_AssignDelegate",
+    kind=PROCESSOR_KIND_STMT
 )
 def process_delegate_subscription(analyzer, context, node) -> Optional[EventSubscriptionNode]:
     """
@@ -564,10 +575,8 @@ def process_delegate_subscription(analyzer, context, node) -> Optional[EventSubs
     else:
         # 如果没有连接的委托引脚，查找其他可能的引脚名称
         handler_pin = None
-        for pin in node.pins:
-            if (pin.direction == "input" and 
-                pin.pin_type != "exec" and 
-                pin.pin_name.lower() in ["delegate", "value", "event"]):
+        for pin in node.data_input_pins():
+            if pin.pin_name.lower() in _DELEGATE_HANDLER_PIN_NAMES:
                 handler_pin = pin
                 break
         
@@ -611,7 +620,8 @@ def process_delegate_subscription(analyzer, context, node) -> Optional[EventSubs
     "K2Node_CallFunction",
     "K2Node_CallArrayFunction", 
     "K2Node_LatentAbilityCall",
-    "K2Node_CreateWidget"
+    "K2Node_CreateWidget",
+    kind=PROCESSOR_KIND_BOTH
 )
 def process_generic_callable(analyzer, context, node) -> Optional[ASTNode]:
     """
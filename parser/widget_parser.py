@@ -9,12 +9,12 @@ UI蓝图构建器
 # 依赖导入
 # ================================================================
 
-from typing import Dict, List, Set
+from typing import Dict, List
 
 from .models import WidgetNode, SourceLocation, RawObject
 from .common.graph_utils import parse_object_path
 from .common.object_parser import BlueprintObjectParser
-from .common.builder_utils import collect_all_raw_objects
+from .common.builder_utils import collect_all_raw_objects, extract_blueprint_path
 
 
 # ================================================================
@@ -45,7 +45,7 @@ class WidgetBuilder:
         slot_objects = []
         
         for obj in all_objects:
-            if "Slot" in obj.class_type or "WidgetSlotPair" in obj.class_type:
+            if obj.is_slot:
                 slot_objects.append(obj)
             elif obj.class_type:  # 有类型的对象才是真正的 Widget
                 widget_objects.append(obj)
@@ -94,21 +94,8 @@ class WidgetBuilder:
                 parent_widget.add_child(child_widget)
     
     def _find_root_nodes(self, widget_nodes: Dict[str, WidgetNode]) -> List[WidgetNode]:
-        """识别根节点（没有父节点的 Widget）"""
-        all_children: Set[str] = set()
-        
-        # 收集所有子节点的名称
-        for widget in widget_nodes.values():
-            for child in widget.children:
-                all_children.add(child.widget_name)
-        
-        # 不在子节点列表中的就是根节点
-        root_widgets = [
-            widget for widget in widget_nodes.values() 
-            if widget.widget_name not in all_children
-        ]
-        
-        return root_widgets
+        """识别根节点（没有父节点的 Widget），依赖 add_child 设置的 has_parent 标记单遍筛选"""
+        return [widget for widget in widget_nodes.values() if not widget.has_parent]
 
 
 # ================================================================
@@ -124,15 +111,14 @@ def parse(blueprint_text: str) -> List[WidgetNode]:
     if not blueprint_text or not blueprint_text.strip():
         return []
 
-    # 第一阶段：使用通用解析器解析文本
-    object_parser = BlueprintObjectParser()
-    raw_objects = object_parser.parse(blueprint_text)
+    # 第一阶段：使用构建器自带的通用解析器解析文本（每次调用只创建一个解析器）
+    widget_builder = WidgetBuilder()
+    raw_objects = widget_builder.object_parser.parse(blueprint_text)
     
     if not raw_objects:
         return []
     
     # 第二阶段：使用 Widget 构建器构建 WidgetNode 树
-    widget_builder = WidgetBuilder()
     return widget_builder.build(raw_objects)
 
 
@@ -141,7 +127,6 @@ def parse_v2(blueprint_text: str) -> 'BlueprintParseResult':
     新版本：解析UE5 UserWidget蓝图文本并返回统一的解析结果
     """
     from .models import BlueprintParseResult
-    import re
     
     if not blueprint_text or not blueprint_text.strip():
         return BlueprintParseResult(
@@ -153,9 +138,9 @@ def parse_v2(blueprint_text: str) -> 'BlueprintParseResult':
         )
     
     try:
-        # 第一阶段：使用通用解析器解析文本
-        object_parser = BlueprintObjectParser()
-        raw_objects = object_parser.parse(blueprint_text)
+        # 第一阶段：使用构建器自带的通用解析器解析文本（每次调用只创建一个解析器）
+        widget_builder = WidgetBuilder()
+        raw_objects = widget_builder.object_parser.parse(blueprint_text)
         
         if not raw_objects:
             return BlueprintParseResult(
@@ -173,13 +158,9 @@ def parse_v2(blueprint_text: str) -> 'BlueprintParseResult':
         blueprint_name = temp_builder._extract_blueprint_name(raw_objects)
         
         # 尝试提取完整路径
-        blueprint_path = ""
-        path_match = re.search(r"/Game/[^'\"]+\.([^'\"]+)", blueprint_text)
-        if path_match:
-            blueprint_path = path_match.group(0)
+        blueprint_path = extract_blueprint_path(blueprint_text)
         
-        # 第二阶段：使用 Widget 构建器构建 WidgetNode 树
-        widget_builder = WidgetBuilder()
+        # 第二阶段：复用同一个 Widget 构建器构建 WidgetNode 树
         widget_nodes = widget_builder.build(raw_objects)
         
         if not widget_nodes:
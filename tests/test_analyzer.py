@@ -0,0 +1,51 @@
+"""
+分析器行为测试
+覆盖处理器分发等快照之外的边界情况
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径，确保能正确导入模块
+current_dir = Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from parser.analyzer import GraphAnalyzer, AnalysisContext
+from parser.models import BlueprintGraph, GraphNode, LiteralExpression, FallbackNode
+from parser.symbol_table import SymbolTable
+
+
+def _make_context(*nodes: GraphNode) -> AnalysisContext:
+    graph = BlueprintGraph(graph_name="EventGraph", nodes={node.node_guid: node for node in nodes})
+    return AnalysisContext(graph=graph, symbol_table=SymbolTable())
+
+
+def test_statement_context_uses_expression_processor():
+    """语句上下文到达表达式处理器标记的节点时，仍返回处理器结果而不是 FallbackNode"""
+    node = GraphNode(
+        node_guid="LITERAL_GUID",
+        node_name="K2Node_Literal_0",
+        class_type="/Script/BlueprintGraph.K2Node_Literal",
+        properties={"ObjectRef": "/Game/Maps/Level.Level:PersistentLevel.Actor_0"},
+    )
+    analyzer = GraphAnalyzer()
+    context = _make_context(node)
+
+    result = analyzer._process_node(context, node)
+
+    assert isinstance(result, LiteralExpression)
+    assert result.value == "/Game/Maps/Level.Level:PersistentLevel.Actor_0"
+
+
+def test_unregistered_node_falls_back():
+    """没有处理器的节点生成 FallbackNode"""
+    node = GraphNode(
+        node_guid="UNKNOWN_GUID",
+        node_name="K2Node_Unknown_0",
+        class_type="/Script/BlueprintGraph.K2Node_DoesNotExist",
+    )
+    analyzer = GraphAnalyzer()
+    context = _make_context(node)
+
+    assert isinstance(analyzer._process_node(context, node), FallbackNode)
@@ -0,0 +1,68 @@
+"""
+通用工具函数测试
+确认基于 str.find / rfind 的实现与原先的正则定义结果一致
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到Python路径，确保能正确导入模块
+current_dir = Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from parser.common.builder_utils import extract_blueprint_path
+from parser.common.graph_utils import _quoted_object_name
+
+
+# extract_blueprint_path 改写前使用的正则
+BLUEPRINT_PATH_RE = re.compile(r"/Game/[^'\"]+\.([^'\"]+)")
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "no asset path here",
+    'Class=/Script/UMG.WidgetBlueprintGeneratedClass Name="WBP_Foo_C"',
+    "ExportPath=\"/Script/UMG.Button'/Game/BPs/UI/WBP_Foo.WBP_Foo:WidgetTree.Button_0'\"",
+    'ObjectRef="/Game/Maps/Level.Level:PersistentLevel.Actor_0"',
+    "/Game/NoDot'/Game/BPs/WBP_Bar.WBP_Bar_C'",
+    "/Game/Trailing.",
+    "/Game/.Leading",
+    "/Game/A.B",
+    "prefix /Game/Unterminated.Path_C",
+    "/Game//Game/Nested.Name'",
+    "'/Game/Quoted'\"/Game/Dotted.Name\"",
+])
+def test_extract_blueprint_path_matches_regex(text):
+    """extract_blueprint_path 与 BLUEPRINT_PATH_RE.search 的匹配结果一致"""
+    match = BLUEPRINT_PATH_RE.search(text)
+    expected = match.group(0) if match else ""
+    assert extract_blueprint_path(text) == expected
+
+
+# _quoted_object_name 改写前使用的正则
+QUOTED_OBJECT_NAME_RE = re.compile(r"'([^']+)'?$")
+
+
+@pytest.mark.parametrize("path", [
+    "",
+    "/Script/UMG.UserWidget",
+    "/Script/UMG.Border'Border_0'",
+    "/Game/BPs/UI/WBP_Foo.WBP_Foo_C'WidgetTree.CanvasPanel_0'",
+    "Class'/Script/UMG.UserWidget'",
+    "/Script/UMG.Border'Border_0",
+    "Border''",
+    "'",
+    "''",
+    "a'b'c'",
+    "a'b''",
+    "'Name'",
+])
+def test_quoted_object_name_matches_regex(path):
+    """_quoted_object_name 与 QUOTED_OBJECT_NAME_RE.search 的匹配结果一致"""
+    match = QUOTED_OBJECT_NAME_RE.search(path)
+    expected = match.group(1) if match else None
+    assert _quoted_object_name(path) == expected
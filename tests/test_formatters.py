@@ -0,0 +1,83 @@
+"""
+格式化器行为测试
+覆盖快照之外的格式化器边界情况
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径，确保能正确导入模块
+current_dir = Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from parser.formatters import MarkdownEventGraphFormatter, WidgetTreeFormatter
+from parser.models import PropertyAccessNode, VariableGetExpression, WidgetNode
+
+
+def test_expression_cache_ignores_reused_ids():
+    """format_ast 之外逐个创建并释放的表达式节点不应命中旧片段（id 可能被复用）"""
+    formatter = MarkdownEventGraphFormatter()
+    results = []
+    for i in range(6):
+        node = PropertyAccessNode(property_name=f"Prop{i}")
+        results.append(node.accept(formatter))
+        del node
+    assert results == [f"Prop{i}" for i in range(6)]
+
+
+def test_expression_cache_reuses_shared_node():
+    """同一节点被多处引用时输出保持一致"""
+    formatter = MarkdownEventGraphFormatter()
+    shared = PropertyAccessNode(target=VariableGetExpression(variable_name="Widget"), property_name="Text")
+    assert shared.accept(formatter) == "Widget.Text"
+    assert shared.accept(formatter) == "Widget.Text"
+
+
+class _BlankStr:
+    """str() 结果为空白的非字符串属性值"""
+
+    def __str__(self):
+        return "   "
+
+
+def test_widget_properties_skip_blank_values():
+    """空白字符串、str() 后为空白的非字符串值都不输出；其余属性按固定顺序输出"""
+    widget = WidgetNode(
+        widget_name="Button_0",
+        widget_type="/Script/UMG.Button",
+        properties={
+            "ButtonText": 'NSLOCTEXT("", "Key", "Play")',
+            "Text": "  ",
+            "Size": _BlankStr(),
+            "SizeBoxWidth": "",
+            "SizeBoxHeight": 200,
+            "Unlisted": "ignored",
+        },
+    )
+    output = WidgetTreeFormatter(show_properties=True).format(widget)
+
+    assert output.splitlines()[2:] == [
+        "- **Button_0** (/Script/UMG.Button)",
+        "  - SizeBoxHeight: `200`",
+        "  - ButtonText: `Play`",
+    ]
+
+
+class _UpperVariableFormatter(MarkdownEventGraphFormatter):
+    """覆盖叶子访问方法的格式化器子类"""
+
+    def visit_variable_get_expression(self, node):
+        return node.variable_name.upper()
+
+
+class _CustomVariableGet(VariableGetExpression):
+    """不在分派表中的节点子类，应回退到 accept"""
+
+
+def test_dispatch_uses_subclass_overrides_and_node_subclasses():
+    """格式化器子类的覆盖方法生效；节点子类经 accept 分派到同一访问方法"""
+    formatter = _UpperVariableFormatter()
+    access = PropertyAccessNode(target=VariableGetExpression(variable_name="widget"), property_name="Text")
+    assert access.accept(formatter) == "WIDGET.Text"
+    assert formatter.format(_CustomVariableGet(variable_name="health")) == "HEALTH"
@@ -0,0 +1,52 @@
+"""
+领域模型测试
+覆盖 GraphNode 引脚派生视图缓存的失效规则
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径，确保能正确导入模块
+current_dir = Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from parser.models import GraphNode, GraphPin
+
+
+def _make_node() -> GraphNode:
+    return GraphNode(
+        node_guid="NODE_GUID",
+        node_name="K2Node_CallFunction_0",
+        class_type="/Script/BlueprintGraph.K2Node_CallFunction",
+        pins=[
+            GraphPin(pin_id="P0", pin_name="execute", direction="input", pin_type="exec"),
+            GraphPin(pin_id="P1", pin_name="A", direction="input", pin_type="int"),
+        ],
+    )
+
+
+def test_pin_views_rebuilt_when_pins_list_replaced():
+    """整体替换 pins 列表后视图自动重建"""
+    node = _make_node()
+    assert node.get_pin("A", "input").pin_id == "P1"
+    assert node.has_exec_pins()
+
+    node.pins = [GraphPin(pin_id="P2", pin_name="B", direction="input", pin_type="int")]
+
+    assert node.get_pin("A", "input") is None
+    assert node.get_pin("B", "input").pin_id == "P2"
+    assert not node.has_exec_pins()
+
+
+def test_invalidate_pin_views_after_in_place_replacement():
+    """原地替换引脚后调用 invalidate_pin_views 即可看到新引脚"""
+    node = _make_node()
+    assert [pin.pin_id for pin in node.data_input_pins()] == ["P1"]
+
+    node.pins[1] = GraphPin(pin_id="P3", pin_name="C", direction="input", pin_type="float")
+    node.invalidate_pin_views()
+
+    assert node.get_pin("A", "input") is None
+    assert node.get_pin("C", "input").pin_id == "P3"
+    assert [pin.pin_id for pin in node.data_input_pins()] == ["P3"]